@@ -66,11 +66,19 @@ setuptools.setup(
     include_package_data=True,
     python_requires=">=3.7",
     install_requires=[
-        "streamlit >= 0.63"
+        "streamlit >= 0.63",
+        "requests",
+        "numpy"
     ],
     extras_require={
         "devel": [
             "wheel"
+        ],
+        "inspect": [
+            "pypdf"
+        ],
+        "render": [
+            "pypdfium2"
         ]
     }
 )
@@ -1,11 +1,23 @@
-import base64
 import os
+import posixpath
+import re
 from pathlib import Path
-from typing import Union, List, Optional, Callable, Dict
+from typing import Any, Union, List, Optional, Callable, Dict, Tuple
 
+import streamlit as st
 import streamlit.components.v1 as components
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import json
 
+from streamlit_pdf_viewer.cache import payload_cache, PayloadCache, CachedPayload, content_digest, source_key
+from streamlit_pdf_viewer.server import DocumentServer, start_document_server, get_document_server
+from streamlit_pdf_viewer.remote import RemoteDocumentCache, remote_cache, is_url
+from streamlit_pdf_viewer.annotations import AnnotationCache, NormalizedAnnotations, PackedAnnotations, annotation_cache
+from streamlit_pdf_viewer.metadata import DocumentInfo, DocumentInfoCache, PageInfo, OutlineItem, document_info_cache, inspect
+from streamlit_pdf_viewer.rendering import DEFAULT_THUMBNAIL_WIDTH, PageImage, PageImageCache, page_image_cache, quantize_scale
+from streamlit_pdf_viewer.prewarm import PrewarmResult, prewarm
+
 _RELEASE = True
 
 if not _RELEASE:
@@ -21,13 +33,208 @@ else:
         path=build_dir
     )
 
+_DELIVERED_DOCUMENTS_STATE = "_streamlit_pdf_viewer_delivered_documents"
+_DELIVERED_ANNOTATIONS_STATE = "_streamlit_pdf_viewer_delivered_annotations"
+_PAGE_IMAGE_REQUESTS_STATE = "_streamlit_pdf_viewer_page_image_requests"
+_MEDIA_FILES_STATE = "_streamlit_pdf_viewer_media_files"
+# Streamlit versions whose media file manager keeps its files and the references of the sessions as
+# `_reference_media_file` expects: checked from 1.14, where it was introduced, to 1.65. Later versions register
+# the files again at each rerun until they are checked.
+_MEDIA_FILE_REFERENCES_VERSIONS = ((1, 14), (1, 66))
+
+
+def _supports_media_file_references(version: str) -> bool:
+    """Return True if files can be referenced again in the media file manager of this Streamlit version."""
+    match = re.match(r"^(\d+)\.(\d+)", version)
+    if match is None:
+        return False
+    lowest, below = _MEDIA_FILE_REFERENCES_VERSIONS
+    return lowest <= (int(match.group(1)), int(match.group(2))) < below
+
+
+_MEDIA_FILE_REFERENCES = _supports_media_file_references(st.__version__)
+
+
+def _payload_for_session(payload: CachedPayload, key: str, persistent_cache: bool = False) -> Optional[str]:
+    """
+    Return the base64 payload only if the frontend of this viewer does not hold the document already.
+
+    The digests sent to each viewer are tracked in the session state. When the frontend reports that
+    a document is missing (e.g. the iframe was re-created), the record is reset and the payload is sent again.
+    With a persistent cache, the browser may hold the document from a previous visit: the payload is first
+    withheld, and sent only once the frontend reports it missing.
+    """
+    delivered = st.session_state.setdefault(_DELIVERED_DOCUMENTS_STATE, {})
+    state = delivered.setdefault(key, {"digests": set(), "request": None, "withheld": set()})
+
+    component_value = st.session_state.get(key)
+    if isinstance(component_value, dict) and 'missing_document' in component_value:
+        if component_value.get('request') != state["request"]:
+            state["request"] = component_value.get('request')
+            state["digests"].clear()
+
+    if payload.digest in state["digests"]:
+        return None
+    state["digests"].add(payload.digest)
+    if persistent_cache and payload.digest not in state["withheld"]:
+        state["withheld"].add(payload.digest)
+        return None
+    return payload.base64
+
+
+def _annotation_delta(annotations: NormalizedAnnotations, key: str) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """
+    Return the changes to the annotations since the ones last sent to this viewer, with the packed data of the
+    added and changed annotations.
+
+    Annotations are identified by their id, or by their content when they have none (see
+    `annotation_identities`). Each change set has a revision, and is based on the previous one. When the
+    frontend reports that it does not hold the base revision (e.g. the iframe was re-created), the record is
+    reset and all the annotations are sent again.
+    """
+    delivered = st.session_state.setdefault(_DELIVERED_ANNOTATIONS_STATE, {})
+    state = delivered.setdefault(key, {"digest": None, "identities": None, "revision": 0, "request": None})
+
+    component_value = st.session_state.get(key)
+    if isinstance(component_value, dict) and 'missing_annotations' in component_value:
+        if component_value.get('request') != state["request"]:
+            state["request"] = component_value.get('request')
+            state["digest"] = None
+            state["identities"] = None
+
+    revision = state["revision"]
+    if annotations.digest == state["digest"]:
+        return {"revision": revision, "base": revision, "upsert": [], "remove": [], "header": None}, None
+
+    current = annotation_cache.identities(annotations)
+    previous = state["identities"]
+    if previous is None:
+        upsert, remove, base = list(current), [], None
+        packed = annotations.packed
+        state["revision"] += 1
+    else:
+        upsert = [identity for identity, (_, content) in current.items()
+                  if identity not in previous or previous[identity][1] != content]
+        remove = [identity for identity in previous if identity not in current]
+        packed = annotations.packed.take([current[identity][0] for identity in upsert])
+        base = revision
+        if upsert or remove:
+            state["revision"] += 1
+    state["digest"] = annotations.digest
+    state["identities"] = current
+    delta = {"revision": state["revision"], "base": base, "upsert": upsert, "remove": remove,
+             "header": packed.header if upsert else None}
+    return delta, packed.data if upsert else None
+
+
+def _add_media_file(path_or_data: Union[str, bytes], mimetype: str, coordinates: str, version: Any) -> str:
+    """
+    Register a file with the Streamlit media file manager and return its URL.
+
+    The registration must be repeated at each rerun, otherwise the media file manager considers the file
+    orphaned and removes it. As the manager reads and hashes the whole file at each registration, the files
+    registered by this session are memoized by coordinates and ``version``, and only referenced again at the
+    following reruns.
+    """
+    media_file_mgr = runtime.get_instance().media_file_mgr
+    registered = st.session_state.setdefault(_MEDIA_FILES_STATE, {})
+    known = registered.get(coordinates)
+    if known is not None and known[0] == version and _reference_media_file(media_file_mgr, known[1], coordinates):
+        return known[2]
+    url = media_file_mgr.add(path_or_data, mimetype, coordinates)
+    registered[coordinates] = (version, posixpath.splitext(posixpath.basename(url))[0], url)
+    return url
+
+
+def _reference_media_file(media_file_mgr, file_id: str, coordinates: str) -> bool:
+    """
+    Reference a file held by the media file manager from the current session, without reading it again.
+
+    This relies on the internals of the media file manager, and is only done for the Streamlit versions in
+    `_MEDIA_FILE_REFERENCES_VERSIONS`. Returns False when the manager no longer holds the file, or when the
+    Streamlit version is not supported, in which case the file must be registered again.
+    """
+    if not _MEDIA_FILE_REFERENCES:
+        return False
+    ctx = get_script_run_ctx()
+    try:
+        lock = media_file_mgr._lock
+        files = media_file_mgr._file_metadata
+        references = media_file_mgr._files_by_session_and_coord
+    except AttributeError:
+        return False
+    if ctx is None:
+        return False
+    with lock:
+        if file_id not in files:
+            return False
+        references.setdefault(ctx.session_id, {})[coordinates] = file_id
+    return True
+
+
+def _register_media_file(input: Union[str, Path, bytes], key: Optional[str]) -> Tuple[str, str]:
+    """
+    Register the PDF document with the Streamlit media file manager and return its URL and identifier.
+
+    Files are memoized by path, modification time and size, binary data by content hash (see `_add_media_file`).
+    """
+    if isinstance(input, bytes):
+        path_or_data = input
+        source_id = content_digest(input)
+        version = source_id
+    else:
+        path_or_data = os.path.abspath(input)
+        source_id = path_or_data
+        version = source_key(path_or_data)
+    coordinates = f"streamlit_pdf_viewer.{key if key is not None else source_id}"
+    url = _add_media_file(path_or_data, "application/pdf", coordinates, version)
+    file_id = posixpath.splitext(posixpath.basename(url))[0]
+    return url, file_id
+
+
+def _register_page_images(images: List[PageImage], key: Optional[str], document_hash: str,
+                          kind: str) -> List[Dict[str, Any]]:
+    """
+    Register page images with the Streamlit media file manager and return their URLs and sizes.
+
+    The images are memoized by document, page and size (see `_add_media_file`).
+    """
+    registered = []
+    for image in images:
+        coordinates = f"streamlit_pdf_viewer.{key if key is not None else document_hash}.{kind}.{image.page}"
+        version = (document_hash, image.page, image.width, image.height)
+        registered.append({
+            "page": image.page,
+            "url": _add_media_file(image.path, image.mimetype, coordinates, version),
+            "width": image.width,
+            "height": image.height,
+        })
+    return registered
+
+
+def _requested_page_images(key: str) -> Optional[Tuple[float, List[int]]]:
+    """
+    Return the scale at which the frontend of this viewer last asked for its pages to be rendered, and the pages
+    it asked for.
+
+    The frontend asks for the pages it lays out near the visible area, when it holds no image of them at a scale
+    matching its zoom level, pixel ratio and resolution boost. The request is kept in the session state, so that
+    the following reruns send the same pages at once.
+    """
+    requests = st.session_state.setdefault(_PAGE_IMAGE_REQUESTS_STATE, {})
+    component_value = st.session_state.get(key)
+    if isinstance(component_value, dict) and 'render_scale' in component_value:
+        requests[key] = (quantize_scale(float(component_value['render_scale'])),
+                         [int(page) for page in component_value.get('pages') or []])
+    return requests.get(key)
+
 
 def pdf_viewer(
         input: Union[str, Path, bytes],
         width: Union[str, int] = "100%",
         height: Optional[int] = None,
         key=None,
-        annotations: List[Dict[str, Union[str, int, float, bool]]] = [],
+        annotations: Union[List[Dict[str, Union[str, int, float, bool]]], Dict[str, Any], Any] = [],
         pages_vertical_spacing: int = 2,
         annotation_outline_size: int = 1,
         pages_to_render: List[int] = (),
@@ -40,15 +247,27 @@ def pdf_viewer(
         scroll_to_annotation: Optional[int] = None,
         on_annotation_click: Optional[Callable[[dict], None]] = None,
         allow_clickable_annotations_with_text_rendering: bool = False,
+        delivery: str = "inline",
+        range_chunk_size: int = 65536,
+        virtualize: bool = False,
+        progressive_rendering: bool = False,
+        render_workers: int = 0,
+        shared_worker: bool = False,
+        persistent_cache: bool = False,
+        incremental_annotations: bool = False,
+        inspect_document: bool = False,
+        show_thumbnails: bool = False,
+        thumbnail_width: int = DEFAULT_THUMBNAIL_WIDTH,
+        render_mode: str = "browser",
 ):
     """
     pdf_viewer function to display a PDF file in a Streamlit app.
 
-    :param input: The source of the PDF file. Accepts a file path, URL, or binary data.
+    :param input: The source of the PDF file. Accepts a file path, an http(s) URL, or binary data. With the "url" and "range" deliveries, URLs are loaded directly by the browser (the remote server must allow CORS requests), otherwise they are downloaded once into a shared on-disk cache (see `remote_cache`).
     :param width: Width of the PDF viewer in pixels. It defaults to 100%. It supports both integer (pixel, e.g. 700) and string (percentages, e.g. 90% will make the pdf render to 90% of the container/window/screen width. If the pdf width is larger than the screen width, it will horizontally scroll).
     :param height: Height of the PDF viewer in pixels. If not provided, the viewer show the whole content.
     :param key: An optional key that uniquely identifies this component. Used to preserve state in Streamlit apps.
-    :param annotations: A list of annotations to be overlaid on the PDF. Each annotation should be a dictionary.
+    :param annotations: Annotations to be overlaid on the PDF. Either a list of dictionaries, or columns named after their keys: a dict of equal-length lists or arrays, a NumPy structured array, a pandas DataFrame or a pyarrow Table. Annotations are validated, sorted by page and sent to the viewer packed in typed arrays; those with an invalid page or coordinates are dropped. The result is cached by content (see `annotation_cache`).
     :param pages_vertical_spacing: The vertical space (in pixels) between each page of the PDF. Defaults to 2 pixels.
     :param annotation_outline_size: Size of the outline around each annotation in pixels. Defaults to 1 pixel.
     :param pages_to_render: Optional list of page numbers to render. If None, all pages are rendered. This allows for selective rendering of pages in the PDF.
@@ -61,9 +280,23 @@ def pdf_viewer(
     :param scroll_to_annotation: Scroll to a specific annotation in the PDF. The parameter is an integer, which represent the positional value of the annotation. E.g. 1, will be the first annotation. Defaults to None.
     :param on_annotation_click: A callback function that will be called when an annotation is clicked. The function should accept a single argument, which is the annotation that was clicked. Defaults to None.
     :param allow_clickable_annotations_with_text_rendering: When True, annotations remain clickable even when render_text is enabled. Note that text selection will not work through annotation areas. Defaults to False.
+    :param delivery: How the PDF document is sent to the viewer. "inline" sends the whole document at each rerun, "once" sends it only the first time and then only its content hash, as long as the viewer still holds it. "once" requires a `key`. "url" serves the document from the Streamlit media endpoint and sends only its URL, so pdf.js can stream it without base64 overhead. "range" serves the document from a local server supporting HTTP range requests (see `start_document_server`), so pdf.js fetches only the parts needed to show the first pages. Defaults to "inline".
+    :param range_chunk_size: Size in bytes of the chunks requested by pdf.js when the document is loaded from a URL. Defaults to 65536.
+    :param virtualize: Whether to rasterize only the pages close to the visible area, and release the pages far from it. The other pages are laid out as placeholders of the same size. Recommended for documents with many pages. Defaults to False.
+    :param progressive_rendering: Whether to show each page first at a low resolution, and then re-render it at the full resolution (including `resolution_boost`) when the browser is idle. Defaults to False.
+    :param render_workers: Number of web workers rasterizing the pages on OffscreenCanvas, so that the viewer stays responsive and several pages are rendered in parallel. Each worker parses its own copy of the document. 0 renders on the main thread of the viewer, which is also the fallback for browsers without OffscreenCanvas. Defaults to 0.
+    :param shared_worker: Whether to parse the document in a pdf.js worker shared by all the viewers of the browser tab which also set this option, instead of in each viewer. The documents received with `delivery="once"` are shared between these viewers by content hash. Falls back to a worker per viewer in browsers without SharedWorker. Defaults to False.
+    :param persistent_cache: Whether to keep the rendered pages, and the documents received with `delivery="once"`, in the browser's IndexedDB across visits. Cached pages are shown right away and rendered accurately in the background; with `delivery="once"` the document is sent only if the browser does not hold it already. Defaults to False.
+    :param incremental_annotations: Whether to send only the annotations added, changed or removed since the previous rerun, instead of all of them, and redraw only the pages whose annotations changed. Annotations are matched by `id`, or by content when they have none. Requires a `key`. Defaults to False.
+    :param inspect_document: Whether to read the page count, the size and the rotation of each page in Python (see `inspect`), and send them to the viewer, which can then lay out the pages without loading each of them first. `pages_to_render` is also checked against the page count. Requires pypdf (`pip install streamlit-pdf-viewer[inspect]`). Defaults to False.
+    :param show_thumbnails: Whether to show a strip of page thumbnails next to the document, to navigate through it. The thumbnails are rendered by the server in worker processes and cached on disk, shared by all sessions (see `page_image_cache`), so the browser does not rasterize the pages to show them. Requires pypdfium2 (`pip install streamlit-pdf-viewer[render]`). Defaults to False.
+    :param thumbnail_width: Width of the thumbnails in pixels. Defaults to 120.
+    :param render_mode: Where the pages are rasterized. "browser" renders them with pdf.js in the viewer. "server" renders them in Python, in worker processes, as the viewer asks for the pages near the visible area at the scale of its zoom level, pixel ratio and `resolution_boost`, and the viewer only shows the images with the annotations on top: the document is not sent to the browser. The images are cached on disk and shared by all sessions (see `page_image_cache`). "server" requires a `key` and pypdfium2 (`pip install streamlit-pdf-viewer[render]`), and does not support `render_text`. Defaults to "browser".
 
     The function reads the PDF file (from a file path, URL, or binary data), encodes it in base64,
     and uses a Streamlit component to render it in the app. It supports optional annotations and adjustable margins.
+    The encoded document is kept in a process-wide cache (`payload_cache`), so that reruns displaying the same PDF
+    do not read and encode it again.
 
     Returns the value of the selected component (if any).
     """
@@ -95,6 +328,23 @@ def pdf_viewer(
     if viewer_align not in ["center", "left", "right"]:
         raise ValueError("viewer_align must be one of 'center', 'left', or 'right'")
 
+    if delivery not in ["inline", "once", "url", "range"]:
+        raise ValueError("delivery must be one of 'inline', 'once', 'url', or 'range'")
+    if delivery == "once" and key is None:
+        raise ValueError("delivery='once' requires a key to identify the viewer across reruns")
+    if not isinstance(range_chunk_size, int) or range_chunk_size < 1024:
+        raise ValueError("range_chunk_size must be an integer of at least 1024 bytes")
+    if incremental_annotations and key is None:
+        raise ValueError("incremental_annotations requires a key to identify the viewer across reruns")
+    if render_mode not in ["browser", "server"]:
+        raise ValueError("render_mode must be one of 'browser' or 'server'")
+    if render_mode == "server" and key is None:
+        raise ValueError("render_mode='server' requires a key to identify the viewer across reruns")
+    if render_mode == "server" and render_text:
+        raise ValueError("render_text is not supported with render_mode='server'")
+    if not isinstance(render_workers, int) or render_workers < 0:
+        raise ValueError("render_workers must be a positive integer, or 0 to render on the main thread")
+
     if scroll_to_page is not None:
         if scroll_to_annotation is not None:
             raise ValueError("scroll_to_page and scroll_to_annotation cannot be used together")
@@ -105,26 +355,86 @@ def pdf_viewer(
         if scroll_to_annotation is not None and scroll_to_annotation < 1:
             scroll_to_annotation = None
 
-    if type(input) is not bytes:
-        with open(input, 'rb') as fo:
-            binary = fo.read()
+    url = None
+    if render_mode == "server":
+        # The pages are rendered by the server, the document itself is not sent to the browser
+        document_hash = page_image_cache.digest(input)
+    elif delivery in ["url", "range"] and is_url(input):
+        url, document_hash = input, content_digest(input.encode('utf-8'))
+    elif delivery == "url":
+        url, document_hash = _register_media_file(input, key)
+    elif delivery == "range":
+        url, document_hash = get_document_server().register(input)
     else:
-        binary = input
-
-    if not isinstance(annotations, list):
-        raise TypeError("annotations must be a list of dictionaries")
-    if any(not isinstance(annotation, dict) for annotation in annotations):
+        payload = payload_cache.get(remote_cache.fetch(input) if is_url(input) else input)
+        document_hash = payload.digest
+
+    page_dimensions = None
+    if inspect_document:
+        document_info = inspect(input)
+        invalid_pages = [page for page in pages_to_render if not 1 <= page <= document_info.page_count]
+        if invalid_pages:
+            raise ValueError(f"pages_to_render contains pages which are not in the document "
+                             f"of {document_info.page_count} pages: {invalid_pages}")
+        page_dimensions = document_info.page_dimensions()
+
+    page_images = None
+    if render_mode == "server":
+        page_dimensions = page_image_cache.page_dimensions(input)
+        requested = _requested_page_images(key)
+        if requested is not None:
+            render_scale, requested_pages = requested
+            pages = [page for page in requested_pages if not pages_to_render or page in pages_to_render]
+            images = page_image_cache.pages(input, pages, render_scale) if pages else []
+            page_images = {"scale": render_scale, "pages": _register_page_images(images, key, document_hash, "page")}
+
+    thumbnails = None
+    if show_thumbnails:
+        thumbnails = _register_page_images(page_image_cache.thumbnails(input, pages_to_render, thumbnail_width), key,
+                                           document_hash, "thumbnail")
+
+    if isinstance(annotations, list) and any(not isinstance(annotation, dict) for annotation in annotations):
         raise TypeError("annotations must be a list of dictionaries")
+    normalized_annotations = annotation_cache.get(annotations)
 
+    packed_annotations = None
+    annotation_delta = None
+    annotation_delta_data = None
+    if incremental_annotations:
+        annotation_delta, annotation_delta_data = _annotation_delta(normalized_annotations, key)
+    else:
+        packed_annotations = normalized_annotations.packed
+
+    binary = None
+    if render_mode == "browser" and delivery == "inline":
+        binary = payload.base64
+    elif render_mode == "browser" and delivery == "once":
+        binary = _payload_for_session(payload, key, persistent_cache)
 
-    base64_pdf = base64.b64encode(binary).decode('utf-8')
     component_value = _component_func(
-        binary=base64_pdf,
+        binary=binary,
+        url=url,
+        document_hash=document_hash,
+        delivery=delivery,
+        range_chunk_size=range_chunk_size,
+        virtualize=virtualize,
+        progressive_rendering=progressive_rendering,
+        render_workers=render_workers,
+        shared_worker=shared_worker,
+        persistent_cache=persistent_cache,
+        page_dimensions=page_dimensions,
+        thumbnails=thumbnails,
+        render_mode=render_mode,
+        page_images=page_images,
         width=width,
         height=height,
         key=key,
         default=0,
-        annotations=annotations,
+        annotations=[],
+        annotations_header=packed_annotations.header if packed_annotations else None,
+        annotations_data=packed_annotations.data if packed_annotations else None,
+        annotation_delta=annotation_delta,
+        annotation_delta_data=annotation_delta_data,
         pages_vertical_spacing=pages_vertical_spacing,
         annotation_outline_size=annotation_outline_size,
         pages_to_render=pages_to_render,
@@ -138,9 +448,27 @@ def pdf_viewer(
         allow_clickable_annotations_with_text_rendering=allow_clickable_annotations_with_text_rendering
     )
 
+    # Requests for a missing document, missing annotations or page images are handled internally and not returned
+    # to the caller
+    if isinstance(component_value, dict) and ('missing_document' in component_value
+                                              or 'missing_annotations' in component_value
+                                              or 'render_scale' in component_value):
+        component_value = 0
+
     # Execute the custom callback function
     if component_value and 'clicked_annotation' in component_value:
-        clicked_annotation = component_value['clicked_annotation']
+        clicked_annotation = dict(component_value['clicked_annotation'])
+        # Report the annotation as it was given, rather than as decoded by the frontend. With incremental
+        # annotations, the frontend generates the ids of the annotations without one, and reports their identity.
+        identity = clicked_annotation.pop('identity', None)
+        annotation_id = str(clicked_annotation.get('id'))
+        given = normalized_annotations.find(annotation_id, generated=not incremental_annotations)
+        if given is None and identity is not None:
+            position = annotation_cache.identities(normalized_annotations).get(identity)
+            given = normalized_annotations.annotation(position[0]) if position is not None else None
+        if given is not None:
+            clicked_annotation = {"index": annotation_id, **given, "id": annotation_id}
+        component_value = {**component_value, "clicked_annotation": clicked_annotation}
         if on_annotation_click is not None and callable(on_annotation_click):
             on_annotation_click(clicked_annotation)
     return component_value
@@ -0,0 +1,352 @@
+import array
+import hashlib
+import json
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+REQUIRED_COLUMNS = ("page", "x", "y", "width", "height", "color")
+COORDINATE_COLUMNS = ("x", "y", "width", "height")
+DEFAULT_BORDER = "solid"
+# Like a CSS outline without a colour, annotations without one use the colour of the text
+DEFAULT_COLOR = "currentcolor"
+# Colours and borders are dictionary-encoded in 16-bit codes
+MAX_DICTIONARY_SIZE = 2 ** 16
+MAX_PAGE = 2 ** 31
+DEFAULT_MAX_ENTRIES = 32
+
+
+class PackedAnnotations(NamedTuple):
+    """
+    Annotations packed in little-endian typed arrays, to be sent to the frontend as binary data.
+
+    ``data`` holds the x, y, width and height columns as float32, followed by the page column as uint32,
+    then the colour and border codes as uint16. ``header`` holds the number of annotations, the
+    dictionaries of colours and borders, the given ids (or None), and the range of each page as
+    ``[page, start, count]``, as the annotations are sorted by page.
+    """
+    header: Dict[str, Any]
+    data: bytes
+
+    def columns(self) -> Dict[str, array.array]:
+        """Return the packed columns, with the colour and border codes."""
+        count = self.header["count"]
+        coordinates = _typed_array("f", self.data[:16 * count])
+        return {
+            "x": coordinates[:count],
+            "y": coordinates[count:2 * count],
+            "width": coordinates[2 * count:3 * count],
+            "height": coordinates[3 * count:],
+            "page": _typed_array("I", self.data[16 * count:20 * count]),
+            "color": _typed_array("H", self.data[20 * count:22 * count]),
+            "border": _typed_array("H", self.data[22 * count:24 * count]),
+        }
+
+    def take(self, indices: List[int]) -> "PackedAnnotations":
+        """Return some of the annotations, in increasing order of position, packed with the same dictionaries."""
+        columns = {name: array.array(column.typecode, [column[index] for index in indices])
+                   for name, column in self.columns().items()}
+        pages = []
+        for start, page in enumerate(columns["page"]):
+            if pages and pages[-1][0] == page:
+                pages[-1][2] += 1
+            else:
+                pages.append([page, start, 1])
+        given_ids = self.header["ids"]
+        header = {
+            "count": len(indices),
+            "colors": self.header["colors"],
+            "borders": self.header["borders"],
+            "ids": [given_ids[index] for index in indices] if given_ids is not None else None,
+            "pages": pages,
+        }
+        names = ("x", "y", "width", "height", "page", "color", "border")
+        return PackedAnnotations(header, b"".join(_little_endian(columns[name]) for name in names))
+
+
+def _typed_array(typecode: str, data: bytes) -> array.array:
+    values = array.array(typecode, data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _little_endian(values: array.array) -> bytes:
+    if sys.byteorder == "big":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class NormalizedAnnotations(NamedTuple):
+    """
+    Valid annotations sorted by page, packed for the frontend.
+
+    Annotations without an id are identified by their position in this order, from 0. ``rows`` holds the
+    annotation dictionaries as they were given, or is None for columnar annotations, whose sorted columns
+    are kept in ``columns``.
+    """
+    digest: str
+    packed: PackedAnnotations
+    columns: Dict[str, np.ndarray]
+    rows: Optional[List[Dict[str, Any]]]
+    ids: Dict[str, int]
+
+    def __len__(self) -> int:
+        return self.packed.header["count"]
+
+    def annotation(self, index: int) -> Dict[str, Any]:
+        """Return an annotation as it was given."""
+        if self.rows is not None:
+            return self.rows[index]
+        return {name: _missing_as_none(column[index].item() if hasattr(column[index], "item") else column[index])
+                for name, column in self.columns.items()}
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        if self.rows is not None:
+            return self.rows
+        names = list(self.columns)
+        values = [[_missing_as_none(value) for value in self.columns[name].tolist()] for name in names]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def find(self, annotation_id: str, generated: bool = True) -> Optional[Dict[str, Any]]:
+        """Return the annotation with a given id, or with a generated id if ``generated`` is True."""
+        if annotation_id in self.ids:
+            return self.annotation(self.ids[annotation_id])
+        given_ids = self.packed.header["ids"]
+        if generated and annotation_id.isdigit() and int(annotation_id) < len(self) \
+                and (given_ids is None or given_ids[int(annotation_id)] is None):
+            return self.annotation(int(annotation_id))
+        return None
+
+
+def _missing_as_none(value: Any) -> Any:
+    # Missing cells of DataFrames are NaN, which cannot be sent as JSON
+    return None if isinstance(value, float) and value != value else value
+
+
+def annotation_columns(annotations: Any) -> Dict[str, Any]:
+    """
+    Return the columns of columnar annotations: a dict of equal-length lists or arrays, a NumPy structured
+    array, a pandas DataFrame or a pyarrow Table.
+    """
+    if isinstance(annotations, dict):
+        return annotations
+    if isinstance(annotations, np.ndarray) and annotations.dtype.names:
+        return {name: annotations[name] for name in annotations.dtype.names}
+    # pyarrow Tables and pandas DataFrames are recognised without importing either library
+    if hasattr(annotations, "column_names") and hasattr(annotations, "column"):
+        return {name: annotations.column(name).to_numpy(zero_copy_only=False) for name in annotations.column_names}
+    if hasattr(annotations, "columns") and hasattr(annotations, "to_numpy"):
+        return {str(name): annotations[name].to_numpy() for name in annotations.columns}
+    raise TypeError("annotations must be a list of dictionaries, a dict of columns, a NumPy structured array, "
+                    "a pandas DataFrame or a pyarrow Table")
+
+
+def annotations_digest(annotations: Any) -> str:
+    """Return the content hash identifying a set of annotations, in any of the accepted forms."""
+    hasher = hashlib.sha256()
+    if isinstance(annotations, list):
+        # Pickling is several times faster than JSON, which is kept for the values that cannot be pickled
+        try:
+            hasher.update(pickle.dumps(annotations, protocol=4))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            hasher.update(json.dumps(annotations, sort_keys=True, default=str).encode("utf-8"))
+        return hasher.hexdigest()
+    for name, column in sorted(annotation_columns(annotations).items()):
+        array = np.asarray(column)
+        hasher.update(f"{name}:{array.dtype}:{len(array)}:".encode("utf-8"))
+        if array.dtype.kind in "biuf":
+            hasher.update(np.ascontiguousarray(array).tobytes())
+        else:
+            hasher.update(json.dumps(array.tolist(), default=str).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _numeric(values: Any) -> np.ndarray:
+    """Convert a column to float64, the values which are not numbers becoming NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        def to_float(value):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return np.nan
+        return np.array([to_float(value) for value in values], dtype=np.float64)
+
+
+def _is_missing(value: Any) -> bool:
+    try:
+        return value is None or bool(value != value) or value == ""
+    except TypeError:
+        return True
+
+
+def _strings(values: Any, default: Optional[str] = None) -> np.ndarray:
+    strings = np.asarray(values, dtype=object)
+    if default is not None:
+        # None, NaN (which differs from itself) and empty strings are missing values
+        try:
+            missing = np.equal(strings, None) | (strings != strings) | np.equal(strings, "")
+        except TypeError:
+            # pandas.NA cannot be compared
+            missing = np.array([_is_missing(value) for value in strings], dtype=bool)
+        strings = np.where(missing, default, strings)
+    return strings.astype(str)
+
+
+def _dictionary_encode(values: np.ndarray, name: str):
+    dictionary, codes = np.unique(values, return_inverse=True)
+    if len(dictionary) > MAX_DICTIONARY_SIZE:
+        raise ValueError(f"annotations may use at most {MAX_DICTIONARY_SIZE} distinct values of {name}")
+    return dictionary.tolist(), codes.astype("<u2")
+
+
+def _given_ids(values: Any) -> List[Optional[str]]:
+    # Like in the list of dictionaries, annotations with an empty id get a generated one
+    return [str(value) if value is not None and value == value and str(value) != "" else None for value in values]
+
+
+def normalize_annotations(annotations: Any, digest: Optional[str] = None) -> NormalizedAnnotations:
+    """
+    Validate, coerce and sort a set of annotations in one batch, and pack them for the frontend.
+
+    Page numbers and coordinates given as strings are converted. Annotations with a page number which is
+    not a positive integer, coordinates which are not finite numbers, a negative size, or a box entirely
+    left of or above the page are dropped. The others are sorted by page, keeping their order within a page.
+    """
+    rows = annotations if isinstance(annotations, list) else None
+    if rows is not None:
+        columns = {name: [row.get(name) for row in rows] for name in REQUIRED_COLUMNS + ("border", "id")}
+    else:
+        columns = {name: np.asarray(column) for name, column in annotation_columns(annotations).items()}
+        missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"annotations are missing the columns: {', '.join(missing)}")
+        if len({len(column) for column in columns.values()}) > 1:
+            raise ValueError("annotation columns must all have the same length")
+
+    pages = _numeric(columns["page"])
+    x, y, width, height = (_numeric(columns[name]) for name in COORDINATE_COLUMNS)
+    with np.errstate(invalid="ignore"):
+        valid = (pages >= 1) & (pages < MAX_PAGE) & (pages == np.floor(pages))
+        for coordinate in (x, y, width, height):
+            valid &= np.isfinite(coordinate)
+        valid &= (width >= 0) & (height >= 0) & (x + width >= 0) & (y + height >= 0)
+
+    kept = np.flatnonzero(valid)
+    order = kept[np.argsort(pages[kept], kind="stable")]
+    count = len(order)
+
+    sorted_pages = pages[order].astype("<u4")
+    coordinates = np.stack([x[order], y[order], width[order], height[order]]).astype("<f4")
+    colors, color_codes = _dictionary_encode(_strings(columns["color"], DEFAULT_COLOR)[order], "color")
+    if "border" in columns:
+        borders, border_codes = _dictionary_encode(_strings(columns["border"], DEFAULT_BORDER)[order], "border")
+    else:
+        borders, border_codes = [DEFAULT_BORDER], np.zeros(count, dtype="<u2")
+    given_ids = _given_ids(np.asarray(columns["id"], dtype=object)[order]) if "id" in columns else [None] * count
+    ids = {annotation_id: index for index, annotation_id in enumerate(given_ids) if annotation_id is not None}
+
+    page_numbers, starts, counts = np.unique(sorted_pages, return_index=True, return_counts=True)
+    header = {
+        "count": count,
+        "colors": colors,
+        "borders": borders,
+        "ids": given_ids if ids else None,
+        "pages": [[int(page), int(start), int(length)] for page, start, length in zip(page_numbers, starts, counts)],
+    }
+    data = b"".join([coordinates.tobytes(), sorted_pages.tobytes(), color_codes.tobytes(), border_codes.tobytes()])
+    return NormalizedAnnotations(
+        digest=digest if digest is not None else annotations_digest(annotations),
+        packed=PackedAnnotations(header, data),
+        columns={} if rows is not None else {name: column[order] for name, column in columns.items()},
+        rows=[rows[index] for index in order.tolist()] if rows is not None else None,
+        ids=ids,
+    )
+
+
+def annotation_identities(normalized: NormalizedAnnotations) -> Dict[str, Tuple[int, Tuple]]:
+    """
+    Identify each annotation by its id, or by a hash of its content as drawn when it has none, and return its
+    position and content by identity. Identical annotations, and hash collisions, are counted, so that each
+    annotation keeps its own identity. The identities are stable within the process.
+    """
+    packed = normalized.packed
+    columns = packed.columns()
+    colors, borders = packed.header["colors"], packed.header["borders"]
+    given_ids = packed.header["ids"] or [None] * len(normalized)
+    identities = {}
+    occurrences: Dict[str, int] = {}
+    contents = zip(columns["page"].tolist(), columns["x"].tolist(), columns["y"].tolist(), columns["width"].tolist(),
+                   columns["height"].tolist(), [colors[code] for code in columns["color"]],
+                   [borders[code] for code in columns["border"]])
+    for index, (given_id, content) in enumerate(zip(given_ids, contents)):
+        identity = f"id:{given_id}" if given_id is not None else f"content:{hash(content) & 0xFFFFFFFFFFFFFFFF:x}"
+        occurrence = occurrences.get(identity, 0)
+        occurrences[identity] = occurrence + 1
+        identities[f"{identity}#{occurrence}" if occurrence else identity] = (index, content)
+    return identities
+
+
+class AnnotationCache:
+    """
+    Process-wide LRU cache of normalized annotations, by content hash, so that reruns displaying the same
+    annotations do not validate and pack them again.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, NormalizedAnnotations]" = OrderedDict()
+        self._identities: Dict[str, Dict[str, Tuple[int, Tuple]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, annotations: Any) -> NormalizedAnnotations:
+        """Return the normalized annotations, normalizing them only on a cache miss."""
+        digest = annotations_digest(annotations)
+        with self._lock:
+            normalized = self._entries.get(digest)
+            if normalized is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return normalized
+            self.misses += 1
+        normalized = normalize_annotations(annotations, digest)
+        with self._lock:
+            self._entries[digest] = normalized
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._identities.pop(evicted, None)
+        return normalized
+
+    def identities(self, normalized: NormalizedAnnotations) -> Dict[str, Tuple[int, Tuple]]:
+        """Return the `annotation_identities` of normalized annotations, computed once per content hash."""
+        with self._lock:
+            identities = self._identities.get(normalized.digest)
+        if identities is None:
+            identities = annotation_identities(normalized)
+            with self._lock:
+                if normalized.digest in self._entries:
+                    self._identities[normalized.digest] = identities
+        return identities
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._identities.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+annotation_cache = AnnotationCache()
@@ -0,0 +1,207 @@
+import base64
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, NamedTuple, Optional, Union
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+LOADING_LOCKS = 64
+# Multiple of 3, so that the chunks are encoded without padding and can be concatenated
+ENCODE_CHUNK_SIZE = 3 * 1024 * 1024
+
+
+class CachedPayload(NamedTuple):
+    """A PDF document ready to be sent to the frontend."""
+    digest: str
+    base64: str
+    size: int
+
+
+def content_digest(binary: Union[bytes, mmap.mmap]) -> str:
+    """Return the content hash used to identify a PDF document."""
+    return hashlib.sha256(binary).hexdigest()
+
+
+def encode_base64(binary: Union[bytes, mmap.mmap]) -> str:
+    """
+    Encode a PDF document in base64, chunk by chunk.
+
+    The chunks are written in a pre-allocated buffer, so that a memory-mapped file is never copied
+    entirely in memory before being encoded.
+    """
+    view = memoryview(binary)
+    try:
+        encoded = bytearray(4 * ((len(view) + 2) // 3))
+        position = 0
+        for offset in range(0, len(view), ENCODE_CHUNK_SIZE):
+            chunk = base64.b64encode(view[offset:offset + ENCODE_CHUNK_SIZE])
+            encoded[position:position + len(chunk)] = chunk
+            position += len(chunk)
+    finally:
+        view.release()
+    return encoded.decode('ascii')
+
+
+def map_file(path: str) -> Union[mmap.mmap, bytes]:
+    """Memory-map a file in read-only mode. Empty files, which cannot be mapped, are returned as bytes."""
+    with open(path, 'rb') as fo:
+        if os.fstat(fo.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(fo.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def source_key(source: Union[str, Path, bytes]) -> Optional[Hashable]:
+    """
+    Return the cache key of a file input, or None for binary inputs.
+
+    Files are identified by their absolute path, modification time and size, so that an unchanged
+    file can be looked up without being read.
+    """
+    if isinstance(source, bytes):
+        return None
+    path = os.path.abspath(source)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+class PayloadCache:
+    """
+    Process-wide LRU cache of base64-encoded PDF payloads.
+
+    Entries are stored by content hash and accounted by the size of their base64 payload. When the
+    total exceeds ``max_bytes``, the least recently used entries are evicted. File inputs are
+    additionally aliased by path, modification time and size, and read through ``mmap``.
+
+    Concurrent requests for the same document wait for the first one to encode it, instead of
+    encoding their own copy.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedPayload]" = OrderedDict()
+        self._aliases: Dict[Hashable, str] = {}
+        self._current_bytes = 0
+        self._lock = threading.RLock()
+        self._loading_locks = [threading.Lock() for _ in range(LOADING_LOCKS)]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int):
+        if value < 0:
+            raise ValueError("max_bytes must be a positive integer")
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    def get(self, source: Union[str, Path, bytes]) -> CachedPayload:
+        """
+        Return the payload for a file path or binary data, encoding it only on a cache miss.
+        """
+        key = source_key(source)
+        if key is None:
+            digest = content_digest(source)
+            with self._lock:
+                payload = self._lookup(digest)
+            if payload is not None:
+                return payload
+            with self._loading(digest):
+                return self._get_or_encode(source, digest)
+
+        payload = self._lookup_alias(key)
+        if payload is not None:
+            return payload
+        with self._loading(key):
+            payload = self._lookup_alias(key)
+            if payload is not None:
+                return payload
+            binary = map_file(key[0])
+            try:
+                payload = self._get_or_encode(binary, content_digest(binary))
+            finally:
+                if isinstance(binary, mmap.mmap):
+                    binary.close()
+            with self._lock:
+                self._aliases[key] = payload.digest
+            return payload
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache counters, useful to size ``max_bytes``."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "current_bytes": self._current_bytes,
+                "max_bytes": self._max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+            self._current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def _get_or_encode(self, binary: Union[bytes, mmap.mmap], digest: str) -> CachedPayload:
+        with self._lock:
+            payload = self._lookup(digest)
+            if payload is not None:
+                return payload
+            self.misses += 1
+        payload = CachedPayload(digest, encode_base64(binary), len(binary))
+        with self._lock:
+            self._store(payload)
+        return payload
+
+    def _loading(self, key: Hashable) -> threading.Lock:
+        """Return the lock serializing the loading of a document, striped to bound their number."""
+        return self._loading_locks[hash(key) % LOADING_LOCKS]
+
+    def _lookup_alias(self, key: Hashable) -> Optional[CachedPayload]:
+        with self._lock:
+            digest = self._aliases.get(key)
+            return self._lookup(digest) if digest is not None else None
+
+    def _lookup(self, digest: str) -> Optional[CachedPayload]:
+        payload = self._entries.get(digest)
+        if payload is not None:
+            self._entries.move_to_end(digest)
+            self.hits += 1
+        return payload
+
+    def _store(self, payload: CachedPayload):
+        entry_bytes = len(payload.base64)
+        if entry_bytes > self._max_bytes:
+            return
+        # Concurrent misses for the same content, e.g. by path and by binary data, store it twice
+        previous = self._entries.pop(payload.digest, None)
+        if previous is not None:
+            self._current_bytes -= len(previous.base64)
+        self._entries[payload.digest] = payload
+        self._current_bytes += entry_bytes
+        self._evict()
+
+    def _evict(self):
+        evicted = set()
+        while self._current_bytes > self._max_bytes and self._entries:
+            digest, payload = self._entries.popitem(last=False)
+            self._current_bytes -= len(payload.base64)
+            self.evictions += 1
+            evicted.add(digest)
+        if evicted:
+            self._aliases = {key: digest for key, digest in self._aliases.items() if digest not in evicted}
+
+
+payload_cache = PayloadCache()
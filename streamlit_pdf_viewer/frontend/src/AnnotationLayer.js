@@ -0,0 +1,363 @@
+/**
+ * Annotations of a page, drawn as one SVG path per colour and border stroke, and hit-tested through a
+ * grid index instead of one element and one listener per annotation.
+ *
+ * Coordinates are in the unscaled page space, which the viewBox of the SVG maps to the page content,
+ * so the layer follows the zoom without being redrawn.
+ */
+const SVG_NS = 'http://www.w3.org/2000/svg';
+const ACCEPTED_BORDER_STYLES = ['solid', 'dashed', 'dotted', 'double', 'groove', 'ridge', 'inset', 'outset', 'none'];
+// The grid index splits the page in GRID_CELLS x GRID_CELLS cells
+const GRID_CELLS = 64;
+
+/**
+ * Columnar annotations, built from the annotation dictionaries. The boxes are kept in typed arrays, the
+ * colours and borders are dictionary-encoded, and rows keeps the dictionaries to report them as they are.
+ */
+export const columnsFromRows = (annotations) => {
+  const count = annotations.length;
+  const columns = {
+    count,
+    page: new Uint32Array(count),
+    x: new Float32Array(count),
+    y: new Float32Array(count),
+    width: new Float32Array(count),
+    height: new Float32Array(count),
+    color: new Uint16Array(count),
+    border: new Uint16Array(count),
+    colors: [],
+    borders: [],
+    ids: new Array(count),
+    rows: annotations,
+    pageRanges: null,
+  };
+  const colorCodes = new Map();
+  const borderCodes = new Map();
+  const encode = (codes, dictionary, value) => {
+    if (!codes.has(value)) {
+      codes.set(value, dictionary.length);
+      dictionary.push(value);
+    }
+    return codes.get(value);
+  };
+  annotations.forEach((annotation, index) => {
+    columns.page[index] = Number(annotation.page);
+    columns.x[index] = Number(annotation.x);
+    columns.y[index] = Number(annotation.y);
+    columns.width[index] = Number(annotation.width);
+    columns.height[index] = Number(annotation.height);
+    columns.color[index] = encode(colorCodes, columns.colors, annotation.color);
+    columns.border[index] = encode(borderCodes, columns.borders, annotation.border);
+    columns.ids[index] = annotation.id;
+  });
+  return columns;
+};
+
+/**
+ * Columnar annotations packed by the Python side (see streamlit_pdf_viewer.annotations), sorted by page.
+ * The typed arrays are views on the received data, which is copied only if it is not aligned for them.
+ */
+export const decodeColumns = (header, data) => {
+  const {count} = header;
+  const bytes = data.byteOffset % 4 === 0 ? data : data.slice();
+  const {buffer, byteOffset} = bytes;
+  const coordinates = new Float32Array(buffer, byteOffset, 4 * count);
+  return {
+    count,
+    x: coordinates.subarray(0, count),
+    y: coordinates.subarray(count, 2 * count),
+    width: coordinates.subarray(2 * count, 3 * count),
+    height: coordinates.subarray(3 * count, 4 * count),
+    page: new Uint32Array(buffer, byteOffset + 16 * count, count),
+    color: new Uint16Array(buffer, byteOffset + 20 * count, count),
+    border: new Uint16Array(buffer, byteOffset + 22 * count, count),
+    colors: header.colors,
+    borders: header.borders,
+    ids: header.ids,
+    rows: null,
+    pageRanges: new Map(header.pages.map(([page, start, count]) => [page, {start, count}])),
+  };
+};
+
+/**
+ * Annotations received as change sets, keyed by identity. Each change set is based on the revision before
+ * it, the whole set is sent again when the viewer does not hold that base revision. The added and changed
+ * annotations are packed like the whole set, in the order of their identities in ``upsert``.
+ */
+export class IncrementalAnnotations {
+  constructor() {
+    this.revision = null;
+    this.rows = new Map();
+    this.cachedColumns = null;
+  }
+
+  /** Apply a change set, return false if it is based on a revision this viewer does not hold. */
+  apply({revision, base, upsert, remove, header}, data) {
+    if (revision === this.revision) return true;
+    if (base !== null && base !== this.revision) return false;
+    if (base === null) {
+      this.rows.clear();
+    }
+    remove.forEach(identity => this.rows.delete(identity));
+    if (upsert.length > 0) {
+      const columns = decodeColumns(header, data);
+      upsert.forEach((identity, index) => this.rows.set(identity, {
+        page: columns.page[index],
+        x: columns.x[index],
+        y: columns.y[index],
+        width: columns.width[index],
+        height: columns.height[index],
+        color: columns.colors[columns.color[index]],
+        border: columns.borders[columns.border[index]],
+        ...(columns.ids && columns.ids[index] !== null ? {id: columns.ids[index]} : {}),
+        // Reported on click, so that Python finds the annotation as it was given
+        identity,
+      }));
+    }
+    this.revision = revision;
+    this.cachedColumns = null;
+    return true;
+  }
+
+  columns() {
+    if (!this.cachedColumns) {
+      this.cachedColumns = columnsFromRows([...this.rows.values()]);
+    }
+    return this.cachedColumns;
+  }
+}
+
+/**
+ * Group the annotations by page in a single pass, unless they are sorted by page already. Annotations
+ * without an id are numbered in page order: over all the pages when sorted by the Python side, over the
+ * rendered pages otherwise.
+ */
+export const bucketAnnotations = (columns, pagesToRender) => {
+  if (columns.pageRanges) {
+    const buckets = new Map();
+    new Set(pagesToRender).forEach(pageNumber => {
+      const {start, count} = columns.pageRanges.get(pageNumber) || {start: 0, count: 0};
+      buckets.set(pageNumber, {indices: Array.from({length: count}, (_, i) => start + i), firstOrdinal: start});
+    });
+    return buckets;
+  }
+
+  const byPage = new Map();
+  for (let index = 0; index < columns.count; index++) {
+    const pageNumber = columns.page[index];
+    if (!byPage.has(pageNumber)) {
+      byPage.set(pageNumber, []);
+    }
+    byPage.get(pageNumber).push(index);
+  }
+
+  const buckets = new Map();
+  let count = 0;
+  [...new Set(pagesToRender)].sort((a, b) => a - b).forEach(pageNumber => {
+    const indices = byPage.get(pageNumber) || [];
+    buckets.set(pageNumber, {indices, firstOrdinal: count});
+    count += indices.length;
+  });
+  return buckets;
+};
+
+const borderStyle = (border) => (border && ACCEPTED_BORDER_STYLES.includes(border) ? border : 'solid');
+
+// The 3D borders are drawn in a darker and a lighter shade of their colour, like the CSS outlines they replace
+const supportsColorMix = typeof CSS !== 'undefined' && CSS.supports
+    && CSS.supports('color', 'color-mix(in srgb, red 50%, black)');
+const shaded = (color, shade) => {
+  if (!shade || !supportsColorMix) return color;
+  return `color-mix(in srgb, ${color} 60%, ${shade === 'dark' ? 'black' : 'white'})`;
+};
+
+/**
+ * Return the strokes drawing a border of the given style and width around a box: their distance from the box
+ * (to their centre), width, sides ('all', 'topLeft' or 'bottomRight') and shade.
+ */
+const borderStrokes = (border, outline) => {
+  const whole = (sides, shade) => ({offset: outline / 2, width: outline, sides, shade});
+  const half = (outer, sides, shade) => (
+    {offset: outer ? 3 * outline / 4 : outline / 4, width: outline / 2, sides, shade}
+  );
+  switch (border) {
+    case 'double':
+      // As in CSS, two lines need a width of at least 3
+      if (outline < 3) return [whole('all')];
+      return [
+        {offset: outline / 6, width: outline / 3, sides: 'all'},
+        {offset: 5 * outline / 6, width: outline / 3, sides: 'all'},
+      ];
+    case 'inset':
+      return [whole('topLeft', 'dark'), whole('bottomRight', 'light')];
+    case 'outset':
+      return [whole('topLeft', 'light'), whole('bottomRight', 'dark')];
+    case 'groove':
+      return [half(true, 'topLeft', 'dark'), half(true, 'bottomRight', 'light'),
+        half(false, 'topLeft', 'light'), half(false, 'bottomRight', 'dark')];
+    case 'ridge':
+      return [half(true, 'topLeft', 'light'), half(true, 'bottomRight', 'dark'),
+        half(false, 'topLeft', 'dark'), half(false, 'bottomRight', 'light')];
+    default:
+      return [whole('all')];
+  }
+};
+
+const strokeSegment = (x, y, width, height, {offset, sides}) => {
+  const left = x - offset;
+  const top = y - offset;
+  const right = x + width + offset;
+  const bottom = y + height + offset;
+  if (sides === 'topLeft') return `M${left} ${bottom}V${top}H${right}`;
+  if (sides === 'bottomRight') return `M${right} ${top}V${bottom}H${left}`;
+  return `M${left} ${top}H${right}V${bottom}H${left}z`;
+};
+
+export class PageAnnotations {
+  constructor(columns, {indices, firstOrdinal}, width, height, outlineSize) {
+    this.columns = columns;
+    this.indices = indices;
+    this.firstOrdinal = firstOrdinal;
+    this.width = width;
+    this.height = height;
+    this.outlineSize = outlineSize;
+    this.byId = null;
+    this.grid = null;
+  }
+
+  // The grid is built on the first hit-test, pages which are never pointed at do not need it
+  buildGrid() {
+    const {columns} = this;
+    this.grid = new Map();
+    this.indices.forEach((index, position) => {
+      const [firstColumn, firstRow] = this.cellOf(columns.x[index], columns.y[index]);
+      const [lastColumn, lastRow] = this.cellOf(
+          columns.x[index] + columns.width[index], columns.y[index] + columns.height[index]);
+      for (let row = firstRow; row <= lastRow; row++) {
+        for (let column = firstColumn; column <= lastColumn; column++) {
+          const cell = row * GRID_CELLS + column;
+          if (!this.grid.has(cell)) {
+            this.grid.set(cell, []);
+          }
+          this.grid.get(cell).push(position);
+        }
+      }
+    });
+  }
+
+  cellOf(x, y) {
+    const clamp = (value) => Math.max(0, Math.min(GRID_CELLS - 1, Math.floor(value)));
+    return [clamp(x / this.width * GRID_CELLS), clamp(y / this.height * GRID_CELLS)];
+  }
+
+  /** Return the annotation at a position of this page, with its id, as reported to Python. */
+  entry(position) {
+    const {columns} = this;
+    const index = this.indices[position];
+    const id = `${(columns.ids && columns.ids[index]) || this.firstOrdinal + position}`;
+    const annotation = columns.rows ? columns.rows[index] : {
+      page: columns.page[index],
+      x: columns.x[index],
+      y: columns.y[index],
+      width: columns.width[index],
+      height: columns.height[index],
+      color: columns.colors[columns.color[index]],
+      border: columns.borders[columns.border[index]],
+    };
+    return {annotation, id};
+  }
+
+  find(id) {
+    if (!this.byId) {
+      this.byId = new Map(this.indices.map((index, position) => [this.entry(position).id, position]));
+    }
+    return this.byId.has(id) ? this.entry(this.byId.get(id)) : null;
+  }
+
+  /** Whether the other annotations of this page are drawn the same, with the same ids. */
+  drawsSameAs(other) {
+    if (!other || other.indices.length !== this.indices.length || other.outlineSize !== this.outlineSize) {
+      return false;
+    }
+    const a = this.columns;
+    const b = other.columns;
+    for (let position = 0; position < this.indices.length; position++) {
+      const i = this.indices[position];
+      const j = other.indices[position];
+      if (a.x[i] !== b.x[j] || a.y[i] !== b.y[j] || a.width[i] !== b.width[j] || a.height[i] !== b.height[j]
+          || a.colors[a.color[i]] !== b.colors[b.color[j]] || a.borders[a.border[i]] !== b.borders[b.border[j]]
+          || this.entry(position).id !== other.entry(position).id) {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  /** Return the annotation at a point of the unscaled page, the last drawn one when they overlap. */
+  hitTest(x, y) {
+    const {columns} = this;
+    if (!this.grid) {
+      this.buildGrid();
+    }
+    const [column, row] = this.cellOf(x, y);
+    const candidates = this.grid.get(row * GRID_CELLS + column);
+    if (!candidates) return null;
+    for (let i = candidates.length - 1; i >= 0; i--) {
+      const index = this.indices[candidates[i]];
+      if (x >= columns.x[index] && x <= columns.x[index] + columns.width[index]
+          && y >= columns.y[index] && y <= columns.y[index] + columns.height[index]) {
+        return this.entry(candidates[i]);
+      }
+    }
+    return null;
+  }
+
+  createLayer(zIndex) {
+    const svg = document.createElementNS(SVG_NS, 'svg');
+    svg.setAttribute('class', 'annotationOverlay');
+    svg.setAttribute('viewBox', `0 0 ${this.width} ${this.height}`);
+    svg.setAttribute('preserveAspectRatio', 'none');
+    svg.style.position = 'absolute';
+    svg.style.top = '0';
+    svg.style.left = '0';
+    svg.style.width = '100%';
+    svg.style.height = '100%';
+    svg.style.overflow = 'visible';
+    svg.style.pointerEvents = 'none';
+    svg.style.zIndex = zIndex;
+
+    const {columns} = this;
+    const outline = this.outlineSize;
+    if (!(outline > 0)) return svg;
+
+    // Like a CSS outline, the strokes are drawn around the box
+    const paths = new Map();
+    this.indices.forEach(index => {
+      const border = borderStyle(columns.borders[columns.border[index]]);
+      if (border === 'none') return;
+      borderStrokes(border, outline).forEach((stroke, part) => {
+        const key = `${columns.color[index]}:${columns.border[index]}:${part}`;
+        if (!paths.has(key)) {
+          paths.set(key, {color: columns.colors[columns.color[index]], border, stroke, segments: []});
+        }
+        paths.get(key).segments.push(strokeSegment(columns.x[index], columns.y[index], columns.width[index],
+            columns.height[index], stroke));
+      });
+    });
+
+    paths.forEach(({color, border, stroke, segments}) => {
+      const path = document.createElementNS(SVG_NS, 'path');
+      path.setAttribute('d', segments.join(''));
+      path.setAttribute('fill', 'none');
+      path.setAttribute('stroke-width', stroke.width);
+      path.style.stroke = shaded(color, stroke.shade);
+      if (border === 'dashed') {
+        path.setAttribute('stroke-dasharray', `${3 * outline} ${3 * outline}`);
+      } else if (border === 'dotted') {
+        path.setAttribute('stroke-dasharray', `${outline} ${outline}`);
+      }
+      svg.appendChild(path);
+    });
+    return svg;
+  }
+}
@@ -0,0 +1,116 @@
+/**
+ * Cache of documents and rendered pages kept in IndexedDB across visits, shared by the viewers of the
+ * origin. The least recently used entries are evicted beyond maxBytes.
+ *
+ * Failures (private browsing, exceeded quota) are logged and reported as cache misses.
+ */
+const DB_NAME = 'streamlit-pdf-viewer';
+const DB_VERSION = 1;
+
+const asPromise = (idbRequest) => new Promise((resolve, reject) => {
+  idbRequest.onsuccess = () => resolve(idbRequest.result);
+  idbRequest.onerror = () => reject(idbRequest.error);
+});
+
+const transactionDone = (transaction) => new Promise((resolve, reject) => {
+  transaction.oncomplete = () => resolve();
+  transaction.onerror = () => reject(transaction.error);
+  transaction.onabort = () => reject(transaction.error);
+});
+
+export default class PersistentCache {
+  constructor(maxBytes) {
+    this.maxBytes = maxBytes;
+    this.database = null;
+  }
+
+  static isSupported() {
+    return typeof indexedDB !== 'undefined';
+  }
+
+  open() {
+    if (!this.database) {
+      this.database = new Promise((resolve, reject) => {
+        const openRequest = indexedDB.open(DB_NAME, DB_VERSION);
+        openRequest.onupgradeneeded = () => {
+          const database = openRequest.result;
+          // The values are kept apart from their metadata, so that a lookup only rewrites the metadata
+          database.createObjectStore('values');
+          database.createObjectStore('entries', {keyPath: 'key'}).createIndex('lastUsed', 'lastUsed');
+        };
+        openRequest.onsuccess = () => resolve(openRequest.result);
+        openRequest.onerror = () => reject(openRequest.error);
+      });
+    }
+    return this.database;
+  }
+
+  async get(key) {
+    try {
+      const database = await this.open();
+      const transaction = database.transaction(['values', 'entries'], 'readwrite');
+      const value = await asPromise(transaction.objectStore('values').get(key));
+      if (value === undefined) return null;
+      const entries = transaction.objectStore('entries');
+      const entry = await asPromise(entries.get(key));
+      if (entry) {
+        entry.lastUsed = Date.now();
+        entries.put(entry);
+      }
+      return value;
+    } catch (error) {
+      console.warn('Persistent cache lookup failed', error);
+      return null;
+    }
+  }
+
+  async put(key, value, size) {
+    if (size > this.maxBytes) return;
+    try {
+      const database = await this.open();
+      const transaction = database.transaction(['values', 'entries'], 'readwrite');
+      transaction.objectStore('values').put(value, key);
+      transaction.objectStore('entries').put({key, size, lastUsed: Date.now()});
+      await transactionDone(transaction);
+      await this.evict();
+    } catch (error) {
+      console.warn('Persistent cache update failed', error);
+    }
+  }
+
+  async evict() {
+    const database = await this.open();
+    const transaction = database.transaction(['values', 'entries'], 'readwrite');
+    const values = transaction.objectStore('values');
+    const cursorRequest = transaction.objectStore('entries').index('lastUsed').openCursor(null, 'prev');
+    let totalBytes = 0;
+    // The most recently used entries are kept, up to the budget
+    cursorRequest.onsuccess = () => {
+      const cursor = cursorRequest.result;
+      if (!cursor) return;
+      totalBytes += cursor.value.size;
+      if (totalBytes > this.maxBytes) {
+        values.delete(cursor.value.key);
+        cursor.delete();
+      }
+      cursor.continue();
+    };
+    await transactionDone(transaction);
+  }
+
+  getDocument(hash) {
+    return this.get(`document:${hash}`);
+  }
+
+  putDocument(hash, data) {
+    return this.put(`document:${hash}`, data, data.byteLength);
+  }
+
+  getPage(key) {
+    return this.get(`page:${key}`);
+  }
+
+  putPage(key, blob) {
+    return this.put(`page:${key}`, blob, blob.size);
+  }
+}
@@ -0,0 +1,98 @@
+/**
+ * Runs page renderings a few at a time, starting with the highest priority ones (lowest value
+ * returned by their priority function), and cancels the pdf.js render tasks of the renderings
+ * that are no longer needed.
+ *
+ * A job is called as job(track, isCancelled): it must pass each pdf.js RenderTask it starts to
+ * track(), and check isCancelled() after each await before touching the DOM.
+ */
+export default class RenderScheduler {
+  constructor(concurrency = 2) {
+    this.concurrency = concurrency;
+    this.pending = new Map();
+    this.running = new Map();
+  }
+
+  /**
+   * Schedule a job, replacing the job with the same key. priority() is called each time the next job
+   * is picked. The promise resolves to true when the job has completed, and to false when it has
+   * been cancelled.
+   */
+  schedule(key, job, priority) {
+    this.cancel(key);
+    return new Promise((resolve, reject) => {
+      this.pending.set(key, {job, priority, resolve, reject});
+      this.runNext();
+    });
+  }
+
+  cancel(key) {
+    const pending = this.pending.get(key);
+    if (pending) {
+      this.pending.delete(key);
+      pending.resolve(false);
+    }
+    const running = this.running.get(key);
+    if (running) {
+      this.running.delete(key);
+      running.cancelled = true;
+      running.tasks.forEach(task => task.cancel());
+    }
+  }
+
+  cancelAll() {
+    [...this.pending.keys(), ...this.running.keys()].forEach(key => this.cancel(key));
+  }
+
+  runNext() {
+    while (this.running.size < this.concurrency && this.pending.size > 0) {
+      const key = this.nextKey();
+      const {job, resolve, reject} = this.pending.get(key);
+      this.pending.delete(key);
+
+      const entry = {tasks: new Set(), cancelled: false};
+      this.running.set(key, entry);
+      const track = (task) => {
+        if (entry.cancelled) {
+          task.cancel();
+        } else {
+          entry.tasks.add(task);
+        }
+        return task;
+      };
+      const isCancelled = () => entry.cancelled;
+
+      Promise.resolve()
+        .then(() => job(track, isCancelled))
+        .then(
+          () => resolve(!entry.cancelled),
+          (error) => {
+            if (entry.cancelled || (error && error.name === 'RenderingCancelledException')) {
+              resolve(false);
+            } else {
+              reject(error);
+            }
+          })
+        .finally(() => {
+          if (this.running.get(key) === entry) {
+            this.running.delete(key);
+          }
+          this.runNext();
+        });
+    }
+  }
+
+  nextKey() {
+    // Priorities are computed when a slot frees up, so that they follow the scrolling
+    let bestKey;
+    let bestPriority = Infinity;
+    for (const [key, {priority: getPriority}] of this.pending) {
+      const priority = getPriority();
+      if (bestKey === undefined || priority < bestPriority) {
+        bestKey = key;
+        bestPriority = priority;
+      }
+    }
+    return bestKey;
+  }
+}
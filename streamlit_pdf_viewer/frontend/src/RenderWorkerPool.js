@@ -0,0 +1,82 @@
+/**
+ * Dispatches page renderings to a few web workers, which rasterize them on OffscreenCanvas and send
+ * back ImageBitmaps.
+ *
+ * render() returns a task shaped like a pdf.js RenderTask ({promise, cancel}), so that it can be
+ * tracked and cancelled by the RenderScheduler like a rendering on the main thread.
+ */
+export default class RenderWorkerPool {
+  constructor(size, createWorker) {
+    this.requests = new Map();
+    this.nextId = 1;
+    this.hash = null;
+    this.workers = Array.from({length: size}, () => {
+      const entry = {worker: createWorker(), pending: 0};
+      entry.worker.onmessage = ({data}) => this.settle(data);
+      return entry;
+    });
+  }
+
+  static isSupported() {
+    return typeof Worker !== 'undefined' && typeof OffscreenCanvas !== 'undefined';
+  }
+
+  /**
+   * Load a document in all the workers. Binary sources are copied, as each worker takes ownership of
+   * the buffer it receives.
+   */
+  load(hash, source, cMapUrl) {
+    this.hash = hash;
+    this.workers.forEach(({worker}) => {
+      const workerSource = source.data ? {...source, data: source.data.slice()} : source;
+      const transfer = workerSource.data ? [workerSource.data.buffer] : [];
+      worker.postMessage({type: 'load', hash, source: workerSource, cMapUrl}, transfer);
+    });
+  }
+
+  render(options) {
+    const id = this.nextId++;
+    // The least busy worker takes the rendering
+    const entry = this.workers.reduce((best, candidate) => (candidate.pending < best.pending ? candidate : best));
+    entry.pending++;
+    const promise = new Promise((resolve, reject) => {
+      this.requests.set(id, {entry, resolve, reject});
+    });
+    entry.worker.postMessage({type: 'render', id, hash: this.hash, ...options});
+
+    return {
+      promise,
+      cancel: () => {
+        if (!this.requests.has(id)) return;
+        entry.worker.postMessage({type: 'cancel', id});
+        this.settle({type: 'failed', id, name: 'RenderingCancelledException', message: 'Rendering cancelled'});
+      },
+    };
+  }
+
+  settle({type, id, bitmap, name, message}) {
+    const request = this.requests.get(id);
+    if (!request) {
+      // Cancelled in the meantime
+      if (bitmap) bitmap.close();
+      return;
+    }
+    this.requests.delete(id);
+    request.entry.pending--;
+    if (type === 'rendered') {
+      request.resolve(bitmap);
+    } else {
+      const error = new Error(message);
+      error.name = name;
+      request.reject(error);
+    }
+  }
+
+  destroy() {
+    [...this.requests.keys()].forEach(id => this.settle({
+      type: 'failed', id, name: 'RenderingCancelledException', message: 'Rendering cancelled',
+    }));
+    this.workers.forEach(({worker}) => worker.terminate());
+    this.workers = [];
+  }
+}
@@ -0,0 +1,34 @@
+/**
+ * Client of the document cache kept by the shared pdf.js worker, so that a viewer can get a document
+ * already received by another viewer of the same browser tab.
+ */
+export default class SharedDocuments {
+  constructor(port) {
+    this.port = port;
+    this.requests = new Map();
+    this.nextId = 1;
+    port.addEventListener('message', ({data: message}) => {
+      if (!message || !message.sharedDocuments || message.sharedDocuments.type !== 'got') return;
+      const {id, data} = message.sharedDocuments;
+      const resolve = this.requests.get(id);
+      if (resolve) {
+        this.requests.delete(id);
+        resolve(data);
+      }
+    });
+  }
+
+  /** Resolves to a copy of the document, or to null when no viewer has shared it. */
+  get(hash) {
+    const id = this.nextId++;
+    return new Promise(resolve => {
+      this.requests.set(id, resolve);
+      this.port.postMessage({sharedDocuments: {type: 'get', id, hash}});
+    });
+  }
+
+  /** Share a copy of a document with the other viewers. */
+  put(hash, data) {
+    this.port.postMessage({sharedDocuments: {type: 'put', hash, data}});
+  }
+}
@@ -0,0 +1,42 @@
+/**
+ * Least recently used cache of rendered tile canvases, bounded by the memory of their bitmaps
+ * (4 bytes per pixel). Evicted canvases are passed to onEvict, which is expected to release them.
+ */
+export default class TileCache {
+  constructor(maxBytes, onEvict) {
+    this.maxBytes = maxBytes;
+    this.onEvict = onEvict;
+    this.tiles = new Map();
+    this.bytes = 0;
+  }
+
+  has(key) {
+    const canvas = this.tiles.get(key);
+    if (canvas === undefined) return false;
+    // Refresh the entry, so that the tiles in view are the last to be evicted
+    this.tiles.delete(key);
+    this.tiles.set(key, canvas);
+    return true;
+  }
+
+  set(key, canvas) {
+    this.delete(key);
+    this.tiles.set(key, canvas);
+    this.bytes += canvas.width * canvas.height * 4;
+    while (this.bytes > this.maxBytes && this.tiles.size > 1) {
+      this.delete(this.tiles.keys().next().value);
+    }
+  }
+
+  delete(key) {
+    const canvas = this.tiles.get(key);
+    if (canvas === undefined) return;
+    this.tiles.delete(key);
+    this.bytes -= canvas.width * canvas.height * 4;
+    this.onEvict(canvas);
+  }
+
+  deletePrefix(prefix) {
+    [...this.tiles.keys()].filter(key => key.startsWith(prefix)).forEach(key => this.delete(key));
+  }
+}
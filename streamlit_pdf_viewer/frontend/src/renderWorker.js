@@ -0,0 +1,83 @@
+/**
+ * Web worker of the RenderWorkerPool: it loads its own copy of the document and rasterizes pages on
+ * OffscreenCanvas, sending them back as ImageBitmaps.
+ */
+import * as pdfjsLib from "pdfjs-dist";
+// The document is parsed in this worker too, instead of in a nested pdf.js worker
+import "pdfjs-dist/build/pdf.worker.mjs";
+
+// pdf.js only needs the document to create its scratch canvases and to load fonts
+const workerDocument = {
+  fonts: self.fonts,
+  createElement(name) {
+    if (name === 'canvas') {
+      return new OffscreenCanvas(1, 1);
+    }
+    throw new Error(`Cannot create a ${name} element in a worker`);
+  },
+};
+
+let loadingTask = null;
+let documentHash = null;
+const renderTasks = new Map();
+const cancelledRequests = new Set();
+
+const load = ({hash, source, cMapUrl}) => {
+  if (loadingTask) {
+    loadingTask.destroy();
+  }
+  documentHash = hash;
+  loadingTask = pdfjsLib.getDocument({
+    ...source,
+    cMapUrl,
+    cMapPacked: true,
+    enableXfa: true,
+    ownerDocument: workerDocument,
+    // Without FontFace support in workers, glyphs are drawn as paths
+    disableFontFace: !self.fonts,
+    isOffscreenCanvasSupported: true,
+  });
+};
+
+const render = async ({id, hash, pageNumber, scale, rotation, width, height, transform}) => {
+  try {
+    if (!loadingTask || hash !== documentHash) {
+      throw new Error(`Document ${hash} is not loaded in this worker`);
+    }
+    const pdf = await loadingTask.promise;
+    const page = await pdf.getPage(pageNumber);
+    if (cancelledRequests.has(id)) return;
+
+    const canvas = new OffscreenCanvas(width, height);
+    const renderTask = page.render({
+      canvasContext: canvas.getContext("2d"),
+      viewport: page.getViewport({scale, rotation}),
+      transform,
+    });
+    renderTasks.set(id, renderTask);
+    await renderTask.promise;
+
+    const bitmap = canvas.transferToImageBitmap();
+    self.postMessage({type: 'rendered', id, bitmap}, [bitmap]);
+  } catch (error) {
+    self.postMessage({type: 'failed', id, name: error.name, message: error.message});
+  } finally {
+    renderTasks.delete(id);
+    cancelledRequests.delete(id);
+  }
+};
+
+self.onmessage = ({data: message}) => {
+  if (message.type === 'load') {
+    load(message);
+  } else if (message.type === 'render') {
+    render(message);
+  } else if (message.type === 'cancel') {
+    const renderTask = renderTasks.get(message.id);
+    if (renderTask) {
+      renderTask.cancel();
+    } else {
+      cancelledRequests.add(message.id);
+    }
+  }
+};
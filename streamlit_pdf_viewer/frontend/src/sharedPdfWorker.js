@@ -0,0 +1,37 @@
+/**
+ * Shared worker hosting the pdf.js worker of all the viewers of a browser tab, instead of one per
+ * viewer iframe, along with a cache of the documents they received, keyed by content hash.
+ */
+import {WorkerMessageHandler} from "pdfjs-dist/build/pdf.worker.mjs";
+
+const MAX_CACHED_DOCUMENTS = 8;
+
+const documents = new Map();
+
+const cacheDocument = (hash, data) => {
+  documents.delete(hash);
+  documents.set(hash, data);
+  while (documents.size > MAX_CACHED_DOCUMENTS) {
+    documents.delete(documents.keys().next().value);
+  }
+};
+
+self.onconnect = (event) => {
+  const port = event.ports[0];
+  // pdf.js ignores the messages that are not addressed to it, the cache messages share its port
+  WorkerMessageHandler.initializeFromPort(port);
+  port.addEventListener('message', ({data: message}) => {
+    if (!message || !message.sharedDocuments) return;
+    const {type, id, hash, data} = message.sharedDocuments;
+    if (type === 'put') {
+      cacheDocument(hash, data);
+    } else if (type === 'get') {
+      const cached = documents.get(hash) || null;
+      if (cached) {
+        cacheDocument(hash, cached);
+      }
+      port.postMessage({sharedDocuments: {type: 'got', id, data: cached}});
+    }
+  });
+  port.start();
+};
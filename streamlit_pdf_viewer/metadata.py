@@ -0,0 +1,205 @@
+import io
+import mmap
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+
+from streamlit_pdf_viewer.cache import content_digest, map_file, source_key
+from streamlit_pdf_viewer.remote import remote_cache, is_url
+
+DEFAULT_MAX_ENTRIES = 4096
+# Used by pdf.js for the pages without a valid MediaBox
+LETTER_SIZE_BOX = (0.0, 0.0, 612.0, 792.0)
+
+
+class PageInfo(NamedTuple):
+    """
+    Visible area of a page, as pdf.js computes it: the CropBox intersected with the MediaBox, in PDF units.
+    ``rotation`` is the clockwise rotation of the page in degrees.
+    """
+    box: Tuple[float, float, float, float]
+    rotation: int
+
+    @property
+    def width(self) -> float:
+        """Width of the page as displayed, after rotation."""
+        width, height = self.box[2] - self.box[0], self.box[3] - self.box[1]
+        return height if self.rotation % 180 else width
+
+    @property
+    def height(self) -> float:
+        """Height of the page as displayed, after rotation."""
+        width, height = self.box[2] - self.box[0], self.box[3] - self.box[1]
+        return width if self.rotation % 180 else height
+
+
+class OutlineItem(NamedTuple):
+    """Entry of the outline (bookmarks) of a document, with the page it points to, if any."""
+    title: str
+    page: Optional[int]
+    children: List["OutlineItem"]
+
+
+class DocumentInfo(NamedTuple):
+    """Page count, page sizes and outline of a PDF document, identified by its content hash."""
+    digest: str
+    page_count: int
+    pages: List[PageInfo]
+    outline: List[OutlineItem]
+
+    def page_dimensions(self) -> List[List[Union[float, int]]]:
+        """Return the box and rotation of each page, as sent to the viewer."""
+        return [[*page.box, page.rotation] for page in self.pages]
+
+
+def _pdf_reader(stream: Any):
+    try:
+        from pypdf import PdfReader
+    except ImportError as error:
+        raise ImportError("Inspecting PDF documents requires pypdf, "
+                          "install it with `pip install streamlit-pdf-viewer[inspect]`") from error
+    return PdfReader(stream)
+
+
+def _box(rectangle: Any) -> Optional[Tuple[float, float, float, float]]:
+    """Return a normalized box, or None if it is missing or empty."""
+    try:
+        x0, y0, x1, y1 = (float(value) for value in rectangle)
+    except (TypeError, ValueError):
+        return None
+    box = (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+    return box if box[2] > box[0] and box[3] > box[1] else None
+
+
+def _page_info(page: Any) -> PageInfo:
+    media_box = _box(page.mediabox) or LETTER_SIZE_BOX
+    crop_box = _box(page.cropbox) or media_box
+    box = (max(crop_box[0], media_box[0]), max(crop_box[1], media_box[1]),
+           min(crop_box[2], media_box[2]), min(crop_box[3], media_box[3]))
+    if not (box[2] > box[0] and box[3] > box[1]):
+        box = media_box
+    # Like pdf.js, rotations which are not a multiple of 90 degrees are ignored
+    rotation = int(page.rotation or 0)
+    rotation = rotation % 360 if rotation % 90 == 0 else 0
+    return PageInfo(box, rotation)
+
+
+def _outline(reader: Any, items: List[Any]) -> List[OutlineItem]:
+    outline = []
+    for item in items:
+        if isinstance(item, list):
+            # A nested list holds the children of the previous item
+            if outline:
+                outline[-1].children.extend(_outline(reader, item))
+            continue
+        try:
+            page_index = reader.get_destination_page_number(item)
+        except Exception:
+            page_index = None
+        page = page_index + 1 if page_index is not None and page_index >= 0 else None
+        outline.append(OutlineItem(str(item.title), page, []))
+    return outline
+
+
+def read_document_info(stream: Any, digest: str) -> DocumentInfo:
+    """Parse a PDF document with pypdf, without rendering it."""
+    reader = _pdf_reader(stream)
+    pages = [_page_info(page) for page in reader.pages]
+    try:
+        outline = _outline(reader, reader.outline)
+    except Exception:
+        # A broken outline does not prevent the document from being displayed
+        outline = []
+    return DocumentInfo(digest, len(pages), pages, outline)
+
+
+class DocumentInfoCache:
+    """
+    Process-wide LRU cache of document metadata, by content hash.
+
+    Like in the payload cache, file inputs are additionally aliased by path, modification time and size, so
+    that an unchanged file is not read again.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, DocumentInfo]" = OrderedDict()
+        self._aliases: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source: Union[str, Path, bytes]) -> DocumentInfo:
+        """Return the metadata of a file path or binary data, parsing the document only on a cache miss."""
+        key = source_key(source)
+        with self._lock:
+            digest = self._aliases.get(key) if key is not None else None
+            if digest is not None and digest in self._entries:
+                return self._lookup(digest)
+
+        if key is None:
+            binary = source
+        else:
+            binary = map_file(key[0])
+        try:
+            digest = content_digest(binary)
+            with self._lock:
+                if key is not None:
+                    self._aliases[key] = digest
+                if digest in self._entries:
+                    return self._lookup(digest)
+                self.misses += 1
+            info = read_document_info(io.BytesIO(binary), digest)
+        finally:
+            if isinstance(binary, mmap.mmap):
+                binary.close()
+
+        with self._lock:
+            self._store(info)
+        return info
+
+    def put(self, source: Union[str, Path], info: DocumentInfo):
+        """Store the metadata of a file read elsewhere, e.g. in another process."""
+        key = source_key(source)
+        with self._lock:
+            self._aliases[key] = info.digest
+            self._store(info)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _store(self, info: DocumentInfo):
+        self._entries[info.digest] = info
+        self._entries.move_to_end(info.digest)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._aliases = {alias: value for alias, value in self._aliases.items() if value != evicted}
+
+    def _lookup(self, digest: str) -> DocumentInfo:
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return self._entries[digest]
+
+
+document_info_cache = DocumentInfoCache()
+
+
+def inspect(input: Union[str, Path, bytes]) -> DocumentInfo:
+    """
+    Return the page count, the visible area and rotation of each page, and the outline of a PDF document,
+    without rendering it.
+
+    Accepts a file path, an http(s) URL (downloaded once into `remote_cache`) or binary data. Requires pypdf,
+    installed with the ``inspect`` extra: ``pip install streamlit-pdf-viewer[inspect]``. The results are cached
+    by content hash in `document_info_cache`.
+    """
+    return document_info_cache.get(remote_cache.fetch(input) if is_url(input) else input)
@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from streamlit_pdf_viewer.cache import payload_cache
+from streamlit_pdf_viewer.metadata import document_info_cache, inspect
+from streamlit_pdf_viewer.remote import remote_cache, is_url
+from streamlit_pdf_viewer.rendering import DEFAULT_THUMBNAIL_WIDTH, page_image_cache, start_process_pool
+
+
+class PrewarmResult(NamedTuple):
+    """Outcome of pre-warming one document: its content hash, or the errors of the steps which failed."""
+    input: str
+    digest: Optional[str]
+    errors: Dict[str, str]
+
+
+def prewarm(inputs: Iterable[Union[str, Path]], workers: Optional[int] = None, payload: bool = True,
+            metadata: bool = False, thumbnails: bool = False,
+            thumbnail_width: int = DEFAULT_THUMBNAIL_WIDTH) -> List[PrewarmResult]:
+    """
+    Prepare a collection of documents ahead of time, filling the caches read by `pdf_viewer`, so that the first
+    display of each document costs the same as a cache hit.
+
+    :param inputs: File paths or http(s) URLs of the documents. URLs are downloaded into `remote_cache`.
+    :param workers: Number of threads and worker processes. Defaults to the number of CPUs.
+    :param payload: Whether to hash and encode the documents into `payload_cache`, as needed by the "inline" and
+        "once" deliveries. Only the documents fitting in its `max_bytes` budget are kept. Defaults to True.
+    :param metadata: Whether to read the metadata of the documents into `document_info_cache`, as needed by
+        `inspect_document=True`. The documents are parsed in worker processes. Requires pypdf. Defaults to False.
+    :param thumbnails: Whether to render the thumbnails of all the pages into `page_image_cache`, as needed by
+        `show_thumbnails=True`. Requires pypdfium2. Defaults to False.
+    :param thumbnail_width: Width of the thumbnails in pixels, as given to `pdf_viewer`. Defaults to 120.
+
+    Returns the outcome for each document, in the order of the inputs. A document failing does not stop the others.
+    """
+    workers = workers or os.cpu_count() or 1
+    inputs = [str(input) for input in inputs]
+    # Parsing is pure Python: the documents are parsed in worker processes, which send back their metadata
+    processes = start_process_pool(workers) if metadata else None
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            sources = {input: threads.submit(remote_cache.fetch, input) if is_url(input) else None
+                       for input in inputs}
+
+            def source(input: str) -> str:
+                return sources[input].result() if sources[input] is not None else input
+
+            def prepare_payload(input: str) -> str:
+                return payload_cache.get(source(input)).digest
+
+            def read_metadata(input: str) -> str:
+                info = processes.submit(inspect, source(input)).result()
+                document_info_cache.put(source(input), info)
+                return info.digest
+
+            def render_thumbnails(input: str) -> str:
+                page_image_cache.thumbnails(source(input), width=thumbnail_width)
+                return page_image_cache.digest(source(input))
+
+            enabled = [(name, step) for name, step, enabled in [("payload", prepare_payload, payload),
+                                                                ("metadata", read_metadata, metadata),
+                                                                ("thumbnails", render_thumbnails, thumbnails)]
+                       if enabled]
+            steps = {input: [(name, threads.submit(step, input)) for name, step in enabled] for input in inputs}
+            return [_result(input, steps[input]) for input in inputs]
+    finally:
+        if processes is not None:
+            processes.shutdown()
+
+
+def _result(input: str, steps: List[Tuple[str, Future]]) -> PrewarmResult:
+    digest = None
+    errors = {}
+    for name, step in steps:
+        try:
+            digest = step.result()
+        except Exception as error:
+            errors[name] = str(error) or type(error).__name__
+    return PrewarmResult(input, digest, errors)
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_REVALIDATE_AFTER = 300
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_DOCUMENT_BYTES = 256 * 1024 * 1024
+DEFAULT_TIMEOUT = 30
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+LOADING_LOCKS = 64
+# Documents used more recently than this, in seconds, are not removed: their path may still be read by a session
+EVICTION_GRACE_PERIOD = 60
+# The time of last use is recorded at most this often, in seconds
+USED_AT_RESOLUTION = 60
+
+logger = logging.getLogger(__name__)
+
+
+def is_url(input: Union[str, Path, bytes]) -> bool:
+    """Return True if the input is an http(s) URL rather than a file path."""
+    return isinstance(input, str) and input.lower().startswith(("http://", "https://"))
+
+
+def default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "streamlit-pdf-viewer", "remote")
+
+
+class RemoteDocumentCache:
+    """
+    Download remote PDF documents through a pooled, keep-alive HTTP session into an on-disk cache.
+
+    Cached documents are considered fresh for ``revalidate_after`` seconds, after which they are
+    revalidated with a conditional request using their ``ETag`` and ``Last-Modified`` headers.
+    Concurrent requests for the same URL wait for a single download, and all sessions share the
+    downloaded file. When the server cannot be reached, the cached copy is used.
+
+    Documents larger than ``max_document_bytes`` are not downloaded. When the downloaded documents exceed
+    ``max_bytes`` in total, the least recently used ones are removed. The time of last use is kept in the metadata
+    of each document, so that the modification time of the downloaded file, by which the other caches alias it,
+    only changes with its content.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, revalidate_after: int = DEFAULT_REVALIDATE_AFTER,
+                 timeout: int = DEFAULT_TIMEOUT, pool_maxsize: int = 16, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_document_bytes: int = DEFAULT_MAX_DOCUMENT_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.revalidate_after = revalidate_after
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_document_bytes = max_document_bytes
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._loading_locks = [threading.Lock() for _ in range(LOADING_LOCKS)]
+        self._evict_lock = threading.Lock()
+
+    def fetch(self, url: str) -> str:
+        """
+        Return the path of the cached copy of the document at ``url``, downloading it if needed.
+        """
+        url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        path = os.path.join(self.cache_dir, f"{url_hash}.pdf")
+        metadata_path = os.path.join(self.cache_dir, f"{url_hash}.json")
+
+        with self._loading_lock(url_hash):
+            metadata = self._read_metadata(metadata_path) if os.path.exists(path) else None
+            if metadata is not None and time.time() - metadata.get("fetched_at", 0) < self.revalidate_after:
+                self._mark_used(metadata_path, metadata)
+                return path
+
+            headers = {}
+            if metadata is not None:
+                if metadata.get("etag"):
+                    headers["If-None-Match"] = metadata["etag"]
+                if metadata.get("last_modified"):
+                    headers["If-Modified-Since"] = metadata["last_modified"]
+
+            try:
+                with self._session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    if response.status_code == 304 and metadata is not None:
+                        metadata["fetched_at"] = metadata["used_at"] = time.time()
+                        self._write_metadata(metadata_path, metadata)
+                        return path
+                    response.raise_for_status()
+                    self._download(response, path)
+                    self._write_metadata(metadata_path, {
+                        "url": url,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "fetched_at": time.time(),
+                        "used_at": time.time(),
+                    })
+            except requests.RequestException as error:
+                if metadata is None:
+                    raise
+                logger.warning("Could not revalidate %s, using the cached copy: %s", url, error)
+                self._mark_used(metadata_path, metadata)
+                return path
+        self._evict(keep=path)
+        return path
+
+    def clear(self):
+        """Remove all the downloaded documents."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _download(self, response: requests.Response, path: str):
+        length = response.headers.get("Content-Length")
+        if length is not None and length.isdigit() and int(length) > self.max_document_bytes:
+            raise ValueError(f"{response.url} is larger than max_document_bytes ({self.max_document_bytes} bytes)")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary_path = f"{path}.{threading.get_ident()}.part"
+        try:
+            downloaded = 0
+            with open(temporary_path, 'wb') as fo:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    downloaded += len(chunk)
+                    # The announced length may be missing or wrong
+                    if downloaded > self.max_document_bytes:
+                        raise ValueError(f"{response.url} is larger than max_document_bytes "
+                                         f"({self.max_document_bytes} bytes)")
+                    fo.write(chunk)
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def _evict(self, keep: str):
+        """
+        Remove the least recently used documents until they fit in ``max_bytes``. The documents used during the
+        grace period are kept.
+        """
+        with self._evict_lock:
+            documents = []
+            try:
+                for entry in os.scandir(self.cache_dir):
+                    if entry.name.endswith(".pdf"):
+                        documents.append((self._used_at(entry.path), entry.stat().st_size, entry.path))
+            except OSError:
+                return
+            total = sum(size for _, size, _ in documents)
+            recently = time.time() - EVICTION_GRACE_PERIOD
+            for used_at, size, path in sorted(documents):
+                if total <= self.max_bytes or used_at > recently:
+                    break
+                if path == keep:
+                    continue
+                url_hash = os.path.basename(path)[:-len(".pdf")]
+                # Not while the document is fetched, which may have marked it used again
+                with self._loading_lock(url_hash):
+                    if self._used_at(path) > recently:
+                        continue
+                    for stale_path in (path, f"{path[:-len('.pdf')]}.json"):
+                        try:
+                            os.remove(stale_path)
+                        except FileNotFoundError:
+                            pass
+                total -= size
+
+    def _loading_lock(self, url_hash: str) -> threading.Lock:
+        return self._loading_locks[int(url_hash, 16) % LOADING_LOCKS]
+
+    def _used_at(self, path: str) -> float:
+        """Return the time a document was last used, from its metadata, or its modification time."""
+        metadata = self._read_metadata(f"{path[:-len('.pdf')]}.json") or {}
+        used_at = metadata.get("used_at")
+        if used_at is None:
+            try:
+                return os.stat(path).st_mtime
+            except OSError:
+                return 0
+        return used_at
+
+    def _mark_used(self, metadata_path: str, metadata: dict):
+        """Record that a document was used, at most every ``USED_AT_RESOLUTION`` seconds."""
+        now = time.time()
+        if now - metadata.get("used_at", 0) >= USED_AT_RESOLUTION:
+            metadata["used_at"] = now
+            try:
+                self._write_metadata(metadata_path, metadata)
+            except OSError as error:
+                logger.warning("Could not record the use of %s: %s", metadata_path, error)
+
+    @staticmethod
+    def _read_metadata(metadata_path: str) -> Optional[dict]:
+        try:
+            with open(metadata_path, 'r', encoding='utf-8') as fo:
+                return json.load(fo)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_metadata(metadata_path: str, metadata: dict):
+        temporary_path = f"{metadata_path}.{threading.get_ident()}.part"
+        with open(temporary_path, 'w', encoding='utf-8') as fo:
+            json.dump(metadata, fo)
+        os.replace(temporary_path, metadata_path)
+
+
+remote_cache = RemoteDocumentCache()
@@ -0,0 +1,447 @@
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import shutil
+import sys
+import threading
+import time
+import types
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from streamlit_pdf_viewer.cache import content_digest, map_file, source_key
+from streamlit_pdf_viewer.remote import remote_cache, is_url
+
+DEFAULT_THUMBNAIL_WIDTH = 120
+IMAGE_FORMATS = {"webp": "image/webp", "png": "image/png"}
+WEBP_QUALITY = 80
+# Page images are rendered at scales rounded up to this step, so that clients with close zoom levels and pixel
+# ratios share the same images
+SCALE_STEP = 0.25
+MAX_SCALE = 8
+LOADING_LOCKS = 64
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Documents used more recently than this are not removed from the cache, their images may still be read
+EVICTION_GRACE_PERIOD = 60
+DOCUMENT_NAME = "document.pdf"
+SIZES_NAME = "sizes.json"
+
+# Serializes the starts of worker processes, during which the main module is swapped
+_main_module_lock = threading.Lock()
+# Set in the worker processes, once all the workers of their pool are started
+_workers_started = None
+
+
+class PageImage(NamedTuple):
+    """Image of a page, stored in the page image cache."""
+    page: int
+    path: str
+    width: int
+    height: int
+    mimetype: str
+
+
+def default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "streamlit-pdf-viewer", "pages")
+
+
+def quantize_scale(scale: float) -> float:
+    """Round a rendering scale up to the next step, within the supported range."""
+    return min(MAX_SCALE, max(SCALE_STEP, math.ceil(scale / SCALE_STEP - 1e-9) * SCALE_STEP))
+
+
+def _pdfium():
+    try:
+        import pypdfium2
+    except ImportError as error:
+        raise ImportError("Rendering pages requires pypdfium2, "
+                          "install it with `pip install streamlit-pdf-viewer[render]`") from error
+    return pypdfium2
+
+
+def page_dimensions(document_path: str) -> List[List[Union[float, int]]]:
+    """
+    Return the box and rotation of each page, in the form sent to the viewer. The box is the intersection of
+    the MediaBox and the CropBox, like in pdf.js.
+    """
+    document = _pdfium().PdfDocument(document_path)
+    try:
+        dimensions = []
+        for page in document:
+            try:
+                dimensions.append([*page.get_bbox(), page.get_rotation()])
+            finally:
+                page.close()
+        return dimensions
+    finally:
+        document.close()
+
+
+def image_name(page: int, image_format: str, width: Optional[int] = None, scale: Optional[float] = None) -> str:
+    return f"{page}-{width}.{image_format}" if width is not None else f"{page}@{scale:g}x.{image_format}"
+
+
+def render_pages(document_path: str, pages: List[int], image_format: str, directory: str,
+                 width: Optional[int] = None, scale: Optional[float] = None) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Rasterize pages of a document, either at a width in pixels or at a scale of their size in points, and write
+    them in ``directory``. Return the width, height and file size of the images by name.
+
+    Runs in the worker processes of the page image cache. The images are written under a temporary name and then
+    renamed, so that concurrent renderings of the same page never expose a partial file.
+    """
+    document = _pdfium().PdfDocument(document_path)
+    sizes = {}
+    try:
+        for page_number in pages:
+            page = document[page_number - 1]
+            try:
+                image = page.render(scale=width / page.get_width() if width is not None else scale).to_pil()
+            finally:
+                page.close()
+            name = image_name(page_number, image_format, width, scale)
+            path = os.path.join(directory, name)
+            temporary_path = f"{path}.{os.getpid()}.part"
+            try:
+                if image_format == "webp":
+                    image.save(temporary_path, format="WEBP", quality=WEBP_QUALITY)
+                else:
+                    image.save(temporary_path, format="PNG", optimize=True)
+                sizes[name] = (*image.size, os.path.getsize(temporary_path))
+                os.replace(temporary_path, path)
+            finally:
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+    finally:
+        document.close()
+    return sizes
+
+
+@contextmanager
+def _without_main_script():
+    """
+    Hide the main module while worker processes are started.
+
+    Streamlit runs the app script as ``__main__``, which spawned processes would otherwise run again on start.
+    """
+    with _main_module_lock:
+        main_module = sys.modules.get("__main__")
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = main_module
+
+
+def _init_worker(workers_started):
+    global _workers_started
+    _workers_started = workers_started
+
+
+def _wait_for_workers():
+    _workers_started.wait()
+
+
+def start_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Start a pool of worker processes, with all its workers at once.
+
+    The main module is hidden only while the workers are started (see `_without_main_script`). Each worker is
+    kept busy until they are all started, so that the pool never needs to start one afterwards, when the main
+    module is visible again.
+    """
+    # Forking the multi-threaded Streamlit server is unsafe, the workers are started fresh instead
+    context = multiprocessing.get_context("spawn")
+    workers_started = context.Event()
+    executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=_init_worker,
+                                   initargs=(workers_started,))
+    try:
+        with _without_main_script():
+            futures = [executor.submit(_wait_for_workers) for _ in range(max_workers)]
+    finally:
+        workers_started.set()
+    for future in futures:
+        future.result()
+    return executor
+
+
+class PageImageCache:
+    """
+    Render page images with pypdfium2 in a pool of worker processes, into an on-disk cache shared by all sessions.
+
+    Images are stored by content hash of the document, page and size (a width for thumbnails, a scale for pages),
+    so that all the sessions displaying the same document use the same images. File inputs are aliased by path,
+    modification time and size, like in the payload cache, and binary inputs are written once in the cache for
+    the workers to read them. ``workers=0`` renders in the calling thread.
+
+    The images of a document, and the copy of a binary input, are stored in one directory, whose modification
+    time is refreshed at each use. When the cache exceeds ``max_bytes``, the least recently used directories are
+    removed, with the aliases of their document. The sizes of the images are recorded next to them, so that they
+    are not read again from the images.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, workers: Optional[int] = None, image_format: str = "webp",
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"image_format must be one of {', '.join(IMAGE_FORMATS)}")
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.workers = workers
+        self.image_format = image_format
+        self.max_bytes = max_bytes
+        self._executor: Optional[Executor] = None
+        self._aliases: Dict[Hashable, str] = {}
+        self._dimensions: Dict[str, List[List[Union[float, int]]]] = {}
+        # Width, height and file size of the images by name, for each document
+        self._sizes: Dict[str, Dict[str, Tuple[int, int, int]]] = {}
+        # Bytes used by each document directory, scanned on first use
+        self._usage: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._loading_locks = [threading.Lock() for _ in range(LOADING_LOCKS)]
+
+    def thumbnails(self, source: Union[str, Path, bytes], pages: Iterable[int] = (),
+                   width: int = DEFAULT_THUMBNAIL_WIDTH) -> List[PageImage]:
+        """
+        Return the thumbnails of the given pages of a document, or of all its pages, rendering only the missing
+        ones. Pages which are not in the document are ignored.
+        """
+        if not isinstance(width, int) or width < 16:
+            raise ValueError("width must be an integer of at least 16 pixels")
+        return self._images(source, pages, width=width)
+
+    def pages(self, source: Union[str, Path, bytes], pages: Iterable[int] = (), scale: float = 1.0) -> List[PageImage]:
+        """
+        Return the images of the given pages of a document, or of all its pages, at a scale of their size in
+        points (1.0 renders one pixel per point), rendering only the missing ones. The scale is rounded up to a
+        multiple of `SCALE_STEP`, up to `MAX_SCALE`. Pages which are not in the document are ignored.
+        """
+        if not scale > 0:
+            raise ValueError("scale must be a positive number")
+        return self._images(source, pages, scale=quantize_scale(scale))
+
+    def digest(self, source: Union[str, Path, bytes]) -> str:
+        """Return the content hash identifying a document, by which its images are cached."""
+        return self._document(source)[0]
+
+    def page_dimensions(self, source: Union[str, Path, bytes]) -> List[List[Union[float, int]]]:
+        """Return the box and rotation of each page of a document, as sent to the viewer."""
+        return self._document_dimensions(*self._document(source))
+
+    def clear(self):
+        """Remove all the images."""
+        with self._lock:
+            self._aliases.clear()
+            self._dimensions.clear()
+            self._sizes.clear()
+            self._usage = None
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def shutdown(self):
+        """Stop the worker processes, they are started again when needed."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _images(self, source: Union[str, Path, bytes], pages: Iterable[int], width: Optional[int] = None,
+                scale: Optional[float] = None) -> List[PageImage]:
+        digest, document_path = self._document(source)
+        directory = os.path.join(self.cache_dir, digest)
+        count = len(self._document_dimensions(digest, document_path))
+        pages = sorted({page for page in pages if 1 <= page <= count}) if pages else list(range(1, count + 1))
+
+        def path_of(page):
+            return os.path.join(directory, image_name(page, self.image_format, width, scale))
+
+        self._touch(directory)
+        missing = [page for page in pages if not os.path.exists(path_of(page))]
+        rendered = False
+        if missing:
+            with self._loading_locks[hash(digest) % LOADING_LOCKS]:
+                missing = [page for page in missing if not os.path.exists(path_of(page))]
+                if missing:
+                    self._render(digest, document_path, missing, directory, width, scale)
+                    rendered = True
+        images = [PageImage(page, path_of(page), *self._size(digest, path_of(page))[:2],
+                            IMAGE_FORMATS[self.image_format]) for page in pages]
+        if rendered:
+            self._evict(keep=digest)
+        return images
+
+    def _document(self, source: Union[str, Path, bytes]):
+        """Return the content hash of a document and a path the workers can read it from."""
+        if is_url(source):
+            source = remote_cache.fetch(source)
+        key = source_key(source)
+        if key is not None:
+            with self._lock:
+                digest = self._aliases.get(key)
+            if digest is None:
+                binary = map_file(key[0])
+                try:
+                    digest = content_digest(binary)
+                finally:
+                    if isinstance(binary, mmap.mmap):
+                        binary.close()
+                with self._lock:
+                    # The previous versions of a modified file are not looked up anymore
+                    self._aliases = {alias: value for alias, value in self._aliases.items() if alias[0] != key[0]}
+                    self._aliases[key] = digest
+            return digest, key[0]
+
+        digest = content_digest(source)
+        directory = os.path.join(self.cache_dir, digest)
+        document_path = os.path.join(directory, DOCUMENT_NAME)
+        if not os.path.exists(document_path):
+            os.makedirs(directory, exist_ok=True)
+            temporary_path = f"{document_path}.{threading.get_ident()}.part"
+            with open(temporary_path, 'wb') as fo:
+                fo.write(source)
+            os.replace(temporary_path, document_path)
+            self._account(digest, len(source))
+        return digest, document_path
+
+    def _document_dimensions(self, digest: str, document_path: str) -> List[List[Union[float, int]]]:
+        with self._lock:
+            dimensions = self._dimensions.get(digest)
+        if dimensions is None:
+            dimensions = page_dimensions(document_path)
+            with self._lock:
+                self._dimensions[digest] = dimensions
+        return dimensions
+
+    def _render(self, digest: str, document_path: str, pages: List[int], directory: str, width: Optional[int],
+                scale: Optional[float]):
+        os.makedirs(directory, exist_ok=True)
+        executor = self._get_executor()
+        if executor is None:
+            sizes = render_pages(document_path, pages, self.image_format, directory, width, scale)
+        else:
+            # Each worker opens the document once and renders an interleaved share of the pages
+            shares = min(len(pages), self._max_workers())
+            futures = [executor.submit(render_pages, document_path, pages[share::shares], self.image_format,
+                                       directory, width, scale) for share in range(shares)]
+            sizes = {}
+            for future in futures:
+                sizes.update(future.result())
+        self._record_sizes(digest, directory, sizes)
+        self._account(digest, sum(size[2] for size in sizes.values()))
+
+    def _max_workers(self) -> int:
+        return self.workers or os.cpu_count() or 1
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers == 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = start_process_pool(self._max_workers())
+            return self._executor
+
+    def _size(self, digest: str, path: str) -> Tuple[int, int, int]:
+        """Return the width, height and file size of an image, from the sizes recorded next to it."""
+        name = os.path.basename(path)
+        with self._lock:
+            sizes = self._sizes.get(digest)
+        if sizes is None:
+            try:
+                with open(os.path.join(os.path.dirname(path), SIZES_NAME), 'r', encoding='utf-8') as fo:
+                    sizes = {name: tuple(size) for name, size in json.load(fo).items()}
+            except (OSError, ValueError):
+                sizes = {}
+            with self._lock:
+                sizes = self._sizes.setdefault(digest, sizes)
+        size = sizes.get(name)
+        if size is None:
+            # Rendered by another process, or before the sizes were recorded
+            from PIL import Image
+
+            # Only the header of the image is read
+            with Image.open(path) as image:
+                size = (*image.size, os.path.getsize(path))
+            self._record_sizes(digest, os.path.dirname(path), {name: size})
+        return size
+
+    def _record_sizes(self, digest: str, directory: str, sizes: Dict[str, Tuple[int, int, int]]):
+        with self._lock:
+            recorded = self._sizes.setdefault(digest, {})
+            recorded.update(sizes)
+            content = json.dumps(recorded)
+        sizes_path = os.path.join(directory, SIZES_NAME)
+        temporary_path = f"{sizes_path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            with open(temporary_path, 'w', encoding='utf-8') as fo:
+                fo.write(content)
+            os.replace(temporary_path, sizes_path)
+        except OSError:
+            # The sizes are read from the images instead
+            pass
+
+    def _account(self, digest: str, size: int):
+        with self._lock:
+            if self._usage is not None:
+                self._usage[digest] = self._usage.get(digest, 0) + size
+
+    @staticmethod
+    def _touch(directory: str):
+        """Mark the images of a document as recently used."""
+        try:
+            os.utime(directory)
+        except OSError:
+            pass
+
+    def _scan_usage(self) -> Dict[str, int]:
+        usage = {}
+        try:
+            directories = [entry for entry in os.scandir(self.cache_dir) if entry.is_dir()]
+        except OSError:
+            return usage
+        for directory in directories:
+            try:
+                usage[directory.name] = sum(entry.stat().st_size for entry in os.scandir(directory.path)
+                                            if entry.is_file())
+            except OSError:
+                pass
+        return usage
+
+    def _evict(self, keep: str):
+        """
+        Remove the least recently used documents, by modification time of their directory, until the cache fits in
+        ``max_bytes``. The documents used during the grace period are kept.
+        """
+        with self._evict_lock:
+            with self._lock:
+                usage = self._usage
+            if usage is None:
+                usage = self._scan_usage()
+                with self._lock:
+                    self._usage = usage
+            with self._lock:
+                total = sum(usage.values())
+                candidates = [digest for digest in usage if digest != keep]
+            if total <= self.max_bytes:
+                return
+            recently = time.time() - EVICTION_GRACE_PERIOD
+            used_at = {}
+            for digest in candidates:
+                try:
+                    used_at[digest] = os.stat(os.path.join(self.cache_dir, digest)).st_mtime
+                except OSError:
+                    used_at[digest] = 0
+            for digest in sorted(candidates, key=used_at.get):
+                if total <= self.max_bytes or used_at[digest] > recently:
+                    break
+                shutil.rmtree(os.path.join(self.cache_dir, digest), ignore_errors=True)
+                with self._lock:
+                    total -= usage.pop(digest, 0)
+                    self._sizes.pop(digest, None)
+                    self._dimensions.pop(digest, None)
+                    self._aliases = {alias: value for alias, value in self._aliases.items() if value != digest}
+
+
+page_image_cache = PageImageCache()
@@ -0,0 +1,212 @@
+import hashlib
+import mmap
+import re
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from streamlit_pdf_viewer.cache import content_digest, map_file, source_key
+
+DEFAULT_MAX_DOCUMENTS = 64
+WRITE_CHUNK_SIZE = 1024 * 1024
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+_DOCUMENT_PATH_PATTERN = re.compile(r"^/documents/([0-9a-f]+)\.pdf$")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range`` header and return the inclusive ``(start, end)`` byte positions.
+
+    Returns None when the whole document should be served, and raises ValueError when the range
+    cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE_PATTERN.match(header.strip())
+    if match is None:
+        # Multiple ranges or other units are not supported, the whole document is sent instead
+        return None
+    first, last = match.groups()
+    if first == "" and last == "":
+        return None
+    if first == "":
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = size - 1 if last == "" else min(int(last), size - 1)
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+class _DocumentRequestHandler(BaseHTTPRequestHandler):
+    server: "_DocumentHTTPServer"
+
+    def do_OPTIONS(self):
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self._send_cors_headers()
+        self.send_header("Access-Control-Allow-Methods", "GET, HEAD, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Range")
+        self.send_header("Access-Control-Max-Age", "86400")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_cors_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Expose-Headers", "Accept-Ranges, Content-Range, Content-Length")
+
+    def _send_error(self, status: HTTPStatus, size: Optional[int] = None):
+        self.send_response(status)
+        self._send_cors_headers()
+        if size is not None:
+            self.send_header("Content-Range", f"bytes */{size}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _serve(self, send_body: bool):
+        match = _DOCUMENT_PATH_PATTERN.match(self.path.split("?", 1)[0])
+        data = self.server.document_server.get(match.group(1)) if match else None
+        if data is None:
+            self._send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        size = len(data)
+        try:
+            byte_range = parse_range(self.headers.get("Range"), size)
+        except ValueError:
+            self._send_error(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, size)
+            return
+
+        if byte_range is None:
+            start, end = 0, size - 1
+            self.send_response(HTTPStatus.OK)
+        else:
+            start, end = byte_range
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self._send_cors_headers()
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Cache-Control", "private, max-age=3600")
+        self.end_headers()
+
+        if not send_body:
+            return
+        view = memoryview(data)
+        try:
+            for offset in range(start, end + 1, WRITE_CHUNK_SIZE):
+                self.wfile.write(view[offset:min(offset + WRITE_CHUNK_SIZE, end + 1)])
+        except (BrokenPipeError, ConnectionResetError):
+            # pdf.js aborts the requests it no longer needs
+            pass
+        finally:
+            view.release()
+
+
+class _DocumentHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, document_server: "DocumentServer"):
+        super().__init__(address, _DocumentRequestHandler)
+        self.document_server = document_server
+
+
+class DocumentServer:
+    """
+    Small HTTP server serving PDF documents with support for ``Range`` requests.
+
+    File inputs are memory-mapped and served without being copied in memory, so that pdf.js can
+    fetch only the byte ranges it needs. The most recently registered ``max_documents`` are kept.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, public_url: Optional[str] = None,
+                 max_documents: int = DEFAULT_MAX_DOCUMENTS):
+        self.max_documents = max_documents
+        self._documents: "OrderedDict[str, Union[mmap.mmap, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._httpd = _DocumentHTTPServer((host, port), self)
+        self.public_url = (public_url or f"http://{host}:{self._httpd.server_port}").rstrip("/")
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="streamlit-pdf-viewer-server",
+                                        daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_port
+
+    def register(self, source: Union[str, Path, bytes]) -> Tuple[str, str]:
+        """
+        Register a file path or binary data and return its URL and identifier.
+        """
+        key = source_key(source)
+        if key is None:
+            document_id = content_digest(source)
+        else:
+            document_id = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+
+        with self._lock:
+            if document_id in self._documents:
+                self._documents.move_to_end(document_id)
+            else:
+                self._documents[document_id] = source if key is None else map_file(key[0])
+                while len(self._documents) > self.max_documents:
+                    # Mapped files are unmapped once the requests still reading them are completed
+                    self._documents.popitem(last=False)
+
+        return f"{self.public_url}/documents/{document_id}.pdf", document_id
+
+    def get(self, document_id: str) -> Optional[Union[mmap.mmap, bytes]]:
+        with self._lock:
+            return self._documents.get(document_id)
+
+    def shutdown(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        with self._lock:
+            self._documents.clear()
+
+
+_document_server: Optional[DocumentServer] = None
+_document_server_lock = threading.Lock()
+
+
+def start_document_server(host: str = "127.0.0.1", port: int = 0, public_url: Optional[str] = None,
+                          max_documents: int = DEFAULT_MAX_DOCUMENTS) -> DocumentServer:
+    """
+    Start the document server used by ``delivery="range"``, replacing any server already running.
+
+    :param host: The interface to listen on. Defaults to "127.0.0.1".
+    :param port: The port to listen on. Defaults to 0, a free port.
+    :param public_url: The URL under which the browser can reach the server, e.g. behind a reverse proxy. Defaults to "http://{host}:{port}".
+    :param max_documents: The number of documents kept available. Defaults to 64.
+    """
+    global _document_server
+    with _document_server_lock:
+        if _document_server is not None:
+            _document_server.shutdown()
+        _document_server = DocumentServer(host, port, public_url, max_documents)
+        return _document_server
+
+
+def get_document_server() -> DocumentServer:
+    """Return the running document server, starting one with the default settings if needed."""
+    global _document_server
+    with _document_server_lock:
+        if _document_server is None:
+            _document_server = DocumentServer()
+        return _document_server
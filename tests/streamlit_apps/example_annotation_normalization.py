@@ -0,0 +1,31 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer, annotation_cache
+
+st.subheader("Test PDF Viewer with annotation normalization")
+
+annotations = [
+    # Given on the second page first, drawn after the annotations of the first page
+    {"page": 2, "x": 100, "y": 100, "width": 100, "height": 50, "color": "blue"},
+    {"page": "1", "x": "40", "y": "40", "width": 200, "height": 200, "color": "green", "label": "target"},
+    # Invalid page, coordinates and size, or left of the page: dropped
+    {"page": 0, "x": 10, "y": 10, "width": 10, "height": 10, "color": "red"},
+    {"page": 1, "x": "abc", "y": 10, "width": 10, "height": 10, "color": "red"},
+    {"page": 1, "x": 10, "y": 10, "width": -10, "height": 10, "color": "red"},
+    {"page": 1, "x": -100, "y": 10, "width": 10, "height": 10, "color": "red"},
+]
+
+
+def on_annotation_click(annotation):
+    st.session_state["clicked"] = f"{annotation['label']} with id {annotation['id']}"
+
+
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, height=800, annotations=annotations,
+           on_annotation_click=on_annotation_click)
+
+st.write(f"Annotation cache entries: {annotation_cache.stats()['entries']}")
+if "clicked" in st.session_state:
+    st.write(f"Clicked annotation {st.session_state['clicked']}")
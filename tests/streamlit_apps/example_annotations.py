@@ -0,0 +1,30 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer
+
+st.subheader("Test PDF Viewer with many annotations")
+
+# A dense grid of small boxes on every page, plus a known target on the first page
+annotations = [
+    {"page": page, "x": 20 + column * 14, "y": 20 + row * 14, "width": 10, "height": 10,
+     "color": "red" if (row + column) % 2 else "blue", "border": "dashed" if row % 3 == 0 else "solid"}
+    for page in range(1, 9)
+    for row in range(50)
+    for column in range(30)
+    if not (page == 1 and row < 20 and column < 20)
+]
+annotations.append({"page": 1, "x": 40, "y": 40, "width": 200, "height": 200, "color": "green", "id": "target"})
+
+
+def on_annotation_click(annotation):
+    st.session_state["clicked"] = annotation["id"]
+
+
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, height=800, annotations=annotations,
+           on_annotation_click=on_annotation_click)
+
+if "clicked" in st.session_state:
+    st.write(f"Clicked annotation {st.session_state['clicked']}")
@@ -0,0 +1,38 @@
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer
+
+st.subheader("Test PDF Viewer with columnar annotations")
+
+# A dense grid of small boxes on every page, plus a known target on the first page
+pages, rows, columns = np.meshgrid(np.arange(1, 9), np.arange(50), np.arange(30), indexing="ij")
+keep = ~((pages == 1) & (rows < 20) & (columns < 20))
+annotations = pd.DataFrame({
+    "page": pages[keep],
+    "x": 20 + columns[keep] * 14,
+    "y": 20 + rows[keep] * 14,
+    "width": 10,
+    "height": 10,
+    "color": np.where((rows[keep] + columns[keep]) % 2 == 1, "red", "blue"),
+    "border": np.where(rows[keep] % 3 == 0, "dashed", "solid"),
+    "id": "",
+})
+target = pd.DataFrame([{"page": 1, "x": 40, "y": 40, "width": 200, "height": 200, "color": "green",
+                        "border": "solid", "id": "target"}])
+annotations = pd.concat([annotations, target], ignore_index=True)
+
+
+def on_annotation_click(annotation):
+    st.session_state["clicked"] = annotation["id"]
+
+
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, height=800, annotations=annotations,
+           on_annotation_click=on_annotation_click)
+
+if "clicked" in st.session_state:
+    st.write(f"Clicked annotation {st.session_state['clicked']}")
@@ -0,0 +1,12 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer
+
+st.subheader("Test PDF Viewer sending the document once")
+
+st.button("Rerun")
+
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, key="once_viewer", delivery="once")
@@ -0,0 +1,10 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer
+
+st.subheader("Test PDF Viewer loading byte ranges")
+
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, delivery="range", range_chunk_size=16384)
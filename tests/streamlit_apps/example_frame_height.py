@@ -0,0 +1,11 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer
+
+st.subheader("Test PDF Viewer with the frame height set before rendering")
+
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, resolution_boost=4, pages_vertical_spacing=10,
+           scroll_to_page=5)
@@ -0,0 +1,24 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer
+
+st.subheader("Test PDF Viewer with incremental annotations")
+
+annotations = [
+    {"page": page, "x": 40 + index * 50, "y": 100 + page * 20, "width": 40, "height": 20,
+     "color": "red" if index % 2 else "blue", "id": f"{page}-{index}"}
+    for page in range(1, 9)
+    for index in range(6)
+]
+
+highlight = st.radio("Highlight", ["all", "red", "page 1"], horizontal=True)
+if highlight == "red":
+    annotations = [annotation for annotation in annotations if annotation["color"] == "red"]
+elif highlight == "page 1":
+    annotations = [annotation for annotation in annotations if annotation["page"] == 1]
+
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, height=800, key="incremental",
+           annotations=annotations, incremental_annotations=True)
@@ -0,0 +1,20 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import inspect, pdf_viewer
+
+st.subheader("Test PDF Viewer with the document inspected in Python")
+
+path = os.path.join(ROOT_DIRECTORY, "resources/test.pdf")
+info = inspect(path)
+st.markdown(f"Page count: {info.page_count}")
+st.markdown(f"First outline entry on page {info.outline[0].page}")
+
+pdf_viewer(path, width=600, inspect_document=True, pages_to_render=[1, 3, 8])
+
+try:
+    pdf_viewer(path, inspect_document=True, pages_to_render=[9])
+except ValueError:
+    st.markdown("Page 9 rejected")
@@ -0,0 +1,15 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer, payload_cache
+
+st.subheader("Test PDF Viewer with payload cache")
+
+payload_cache.clear()
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, key="first")
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, key="second")
+
+stats = payload_cache.stats()
+st.text(f"Cache hits: {stats['hits']}, misses: {stats['misses']}, entries: {stats['entries']}")
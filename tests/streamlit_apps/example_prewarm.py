@@ -0,0 +1,19 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import document_info_cache, payload_cache, pdf_viewer, prewarm
+
+st.subheader("Test PDF Viewer with pre-warmed caches")
+
+path = os.path.join(ROOT_DIRECTORY, "resources/test.pdf")
+results = prewarm([path, os.path.join(ROOT_DIRECTORY, "resources/missing.pdf")], workers=2, metadata=True)
+st.markdown(f"Prewarmed {sum(not result.errors for result in results)} documents, "
+            f"{sum(bool(result.errors) for result in results)} failed")
+
+payload_hits = payload_cache.stats()["hits"]
+metadata_hits = document_info_cache.stats()["hits"]
+pdf_viewer(path, width=600, inspect_document=True)
+st.markdown(f"Payload from cache: {payload_cache.stats()['hits'] > payload_hits}")
+st.markdown(f"Metadata from cache: {document_info_cache.stats()['hits'] > metadata_hits}")
@@ -0,0 +1,13 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer, get_document_server
+
+st.subheader("Test PDF Viewer with a remote URL")
+
+# The document server stands in for a remote web server
+url, _ = get_document_server().register(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"))
+
+pdf_viewer(url, width=600)
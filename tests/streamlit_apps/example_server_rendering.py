@@ -0,0 +1,22 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer
+
+st.subheader("Test PDF Viewer with the pages rendered by the server")
+
+annotations = [{"page": 1, "x": 40, "y": 40, "width": 200, "height": 200, "color": "green", "id": "target"}]
+
+
+def on_annotation_click(annotation):
+    st.session_state["clicked"] = annotation["id"]
+
+
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=600, key="server_rendering",
+           render_mode="server", pages_to_render=[1, 2, 3], annotations=annotations,
+           on_annotation_click=on_annotation_click)
+
+if "clicked" in st.session_state:
+    st.write(f"Clicked annotation {st.session_state['clicked']}")
@@ -0,0 +1,14 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer
+
+st.subheader("Test PDF Viewer with a shared worker")
+
+col1, col2 = st.columns(2)
+with col1:
+    pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), key="left", delivery="once", shared_worker=True)
+with col2:
+    pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), key="right", delivery="once", shared_worker=True)
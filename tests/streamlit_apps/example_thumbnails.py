@@ -0,0 +1,11 @@
+import os
+
+import streamlit as st
+from tests import ROOT_DIRECTORY
+
+from streamlit_pdf_viewer import pdf_viewer
+
+st.subheader("Test PDF Viewer with a strip of page thumbnails")
+
+pdf_viewer(os.path.join(ROOT_DIRECTORY, "resources/test.pdf"), width=800, height=600, show_thumbnails=True,
+           thumbnail_width=100, virtualize=True)
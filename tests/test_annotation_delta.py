@@ -0,0 +1,98 @@
+import pytest
+
+import streamlit_pdf_viewer
+from streamlit_pdf_viewer import annotation_cache
+from streamlit_pdf_viewer.annotations import normalize_annotations
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the annotation change sets, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def session_state(monkeypatch):
+    state = {}
+    monkeypatch.setattr(streamlit_pdf_viewer.st, "session_state", state)
+    annotation_cache.clear()
+    return state
+
+
+def box(page, x, color="red", **extra):
+    return {"page": page, "x": x, "y": 10, "width": 20, "height": 20, "color": color, **extra}
+
+
+def delta_of(annotations, key="viewer"):
+    return streamlit_pdf_viewer._annotation_delta(annotation_cache.get(annotations), key)
+
+
+def test_sends_all_the_annotations_first():
+    delta, data = delta_of([box(1, 0, id="a"), box(2, 0)])
+
+    assert delta["base"] is None
+    assert delta["revision"] == 1
+    assert delta["upsert"][0] == "id:a"
+    assert delta["header"]["count"] == 2
+    assert len(data) == 2 * 24
+
+
+def test_sends_an_empty_change_set_for_the_same_annotations():
+    delta_of([box(1, 0, id="a"), box(2, 0)])
+
+    delta, data = delta_of([box(1, 0, id="a"), box(2, 0)])
+
+    assert delta == {"revision": 1, "base": 1, "upsert": [], "remove": [], "header": None}
+    assert data is None
+
+
+def test_sends_only_the_changed_annotations_packed():
+    delta_of([box(1, 0, id="a"), box(1, 50, id="b"), box(2, 0)])
+
+    delta, data = delta_of([box(1, 0, id="a"), box(1, 60, id="b"), box(3, 0, color="blue")])
+
+    assert delta["base"] == 1
+    assert delta["revision"] == 2
+    assert delta["upsert"][0] == "id:b"
+    assert len(delta["upsert"]) == 2
+    assert len(delta["remove"]) == 1
+    assert delta["header"]["count"] == 2
+    assert delta["header"]["ids"] == ["b", None]
+    assert delta["header"]["pages"] == [[1, 0, 1], [3, 1, 1]]
+    assert len(data) == 2 * 24
+
+
+def test_counts_identical_annotations_without_id():
+    first, _ = delta_of([box(1, 0), box(1, 0), box(1, 0)])
+    assert len(set(first["upsert"])) == 3
+
+    delta, data = delta_of([box(1, 0), box(1, 0)])
+
+    assert delta["upsert"] == []
+    assert len(delta["remove"]) == 1
+    assert data is None
+
+
+def test_sends_all_the_annotations_again_when_the_viewer_misses_them(session_state):
+    delta_of([box(1, 0, id="a")])
+    session_state["viewer"] = {"missing_annotations": 1, "request": 123}
+
+    delta, _ = delta_of([box(1, 0, id="a")])
+
+    assert delta["base"] is None
+    assert delta["revision"] == 2
+    assert delta["upsert"] == ["id:a"]
+
+
+def test_taking_all_the_annotations_packs_them_the_same():
+    packed = normalize_annotations([box(2, 0), box(1, 5, id="a"), box(1, 9, color="blue", border="dashed")]).packed
+
+    taken = packed.take(list(range(3)))
+
+    assert taken.data == packed.data
+    assert taken.header == packed.header
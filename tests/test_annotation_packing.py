@@ -0,0 +1,61 @@
+import pytest
+
+from streamlit_pdf_viewer.annotations import DEFAULT_COLOR, normalize_annotations
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the annotation packing, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+BOXES = {"page": [1, 1, 2, 2], "x": [0, 10, 20, 30], "y": [0, 10, 20, 30], "width": [5] * 4, "height": [5] * 4}
+
+
+def colors_of(normalized):
+    """Return the colour of each packed annotation."""
+    header, data = normalized.packed
+    count = header["count"]
+    # The colour codes follow the coordinates (4 float32) and the pages (uint32)
+    offset = 4 * 4 * count + 4 * count
+    codes = [int.from_bytes(data[offset + 2 * index:offset + 2 * index + 2], "little") for index in range(count)]
+    return [header["colors"][code] for code in codes]
+
+
+def test_missing_colors_of_a_list_use_the_default_color():
+    annotations = [dict(zip(BOXES, values)) for values in zip(*BOXES.values())]
+    annotations[0]["color"] = "red"
+    annotations[1]["color"] = None
+    annotations[2]["color"] = ""
+
+    assert colors_of(normalize_annotations(annotations)) == ["red", DEFAULT_COLOR, DEFAULT_COLOR, DEFAULT_COLOR]
+
+
+def test_missing_colors_of_a_dict_of_columns_use_the_default_color():
+    normalized = normalize_annotations({**BOXES, "color": ["red", None, float("nan"), "blue"]})
+
+    assert colors_of(normalized) == ["red", DEFAULT_COLOR, DEFAULT_COLOR, "blue"]
+    assert "nan" not in normalized.packed.header["colors"]
+
+
+def test_missing_colors_of_a_dataframe_use_the_default_color():
+    pd = pytest.importorskip("pandas")
+
+    for color in (["red", None, float("nan"), "blue"], pd.array(["red", None, pd.NA, "blue"], dtype="string")):
+        normalized = normalize_annotations(pd.DataFrame({**BOXES, "color": color}))
+
+        assert colors_of(normalized) == ["red", DEFAULT_COLOR, DEFAULT_COLOR, "blue"]
+
+
+def test_missing_colors_of_a_pyarrow_table_use_the_default_color():
+    pa = pytest.importorskip("pyarrow")
+
+    normalized = normalize_annotations(pa.table({**BOXES, "color": ["red", None, None, "blue"]}))
+
+    assert colors_of(normalized) == ["red", DEFAULT_COLOR, DEFAULT_COLOR, "blue"]
+    assert "None" not in normalized.packed.header["colors"]
@@ -0,0 +1,65 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_annotations.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_draw_annotations_as_one_layer_per_page(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with many annotations")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(pdf_viewer).to_be_visible()
+
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert len(canvases) == 8
+
+    # Thousands of annotations, drawn without an element for each of them
+    expect(pdf_viewer.locator("svg.annotationOverlay")).to_have_count(8)
+    expect(pdf_viewer.locator('[id^="annotation-"]')).to_have_count(0)
+    # One path per colour and border style
+    assert iframe_frame.locator('div[id="page_1"] svg.annotationOverlay path').count() <= 5
+
+
+def test_should_report_the_clicked_annotation(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    wait_for_canvases(iframe_frame.locator('div[id="pdfViewer"] canvas'))
+
+    overlay = iframe_frame.locator('div[id="page_1"] svg.annotationOverlay')
+    page_width = float(overlay.get_attribute("viewBox").split()[2])
+    box = overlay.bounding_box()
+    scale = box["width"] / page_width
+
+    # Middle of the target annotation
+    overlay.click(position={"x": 140 * scale, "y": 140 * scale}, force=True)
+
+    expect(page.get_by_text("Clicked annotation target")).to_be_visible()
@@ -0,0 +1,52 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_delivery_once.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_keep_document_after_rerun(page: Page):
+    expect(page.get_by_text("Test PDF Viewer sending the document once")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(pdf_viewer).to_be_visible()
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert len(canvases) > 0
+
+    # After the rerun only the content hash is sent, the viewer must keep showing the document
+    page.get_by_role("button", name="Rerun").click()
+    page.get_by_role("img", name="Running...").is_hidden()
+
+    canvases_after_rerun = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert len(canvases_after_rerun) == len(canvases)
+    for canvas in canvases_after_rerun:
+        expect(canvas).to_be_visible()
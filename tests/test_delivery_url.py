@@ -0,0 +1,67 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_delivery_url.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_render_from_media_url(page: Page):
+    expect(page.get_by_text("Test PDF Viewer served from the media endpoint")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(pdf_viewer).to_be_visible()
+
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert len(canvases) > 0
+    for canvas in canvases:
+        expect(canvas).to_be_visible()
+
+
+def test_should_not_load_the_document_again_when_zooming(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    width = canvases[0].bounding_box()["width"]
+
+    document_requests = []
+    page.on("request", lambda request: document_requests.append(request.url) if "/media/" in request.url else None)
+    iframe_frame.locator("button.zoom-button").click()
+    iframe_frame.locator("button.zoom-preset").filter(has_text="200%").click()
+
+    # The pages are laid out and rasterized again from the document already parsed
+    deadline = time.time() + 10
+    while pdf_viewer.locator("canvas").first.bounding_box()["width"] < 1.5 * width and time.time() < deadline:
+        time.sleep(0.2)
+    wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert pdf_viewer.locator("canvas").first.bounding_box()["width"] >= 1.5 * width
+    assert document_requests == []
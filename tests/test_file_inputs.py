@@ -0,0 +1,77 @@
+import base64
+import mmap
+import os
+
+import pytest
+
+from streamlit_pdf_viewer import cache as cache_module
+from streamlit_pdf_viewer.cache import PayloadCache, encode_base64, map_file
+from tests import ROOT_DIRECTORY
+
+DOCUMENT = os.path.join(ROOT_DIRECTORY, "resources", "test.pdf")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the memory-mapped file inputs, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+def test_maps_file_inputs_instead_of_reading_them():
+    binary = map_file(DOCUMENT)
+    try:
+        assert isinstance(binary, mmap.mmap)
+        with open(DOCUMENT, 'rb') as fo:
+            assert binary[:] == fo.read()
+    finally:
+        binary.close()
+
+
+def test_maps_empty_files_as_bytes(tmp_path):
+    path = tmp_path / "empty.pdf"
+    path.write_bytes(b"")
+
+    assert map_file(str(path)) == b""
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 10, 11, 12])
+def test_encodes_in_chunks_as_a_whole(monkeypatch, size):
+    # Chunks smaller than the documents
+    monkeypatch.setattr(cache_module, "ENCODE_CHUNK_SIZE", 3)
+    binary = bytes(range(size))
+
+    assert encode_base64(binary) == base64.b64encode(binary).decode('ascii')
+
+
+def test_encodes_a_mapped_file_like_its_content():
+    binary = map_file(DOCUMENT)
+    try:
+        encoded = encode_base64(binary)
+    finally:
+        binary.close()
+
+    with open(DOCUMENT, 'rb') as fo:
+        assert encoded == base64.b64encode(fo.read()).decode('ascii')
+
+
+def test_maps_an_unchanged_file_once(monkeypatch):
+    mapped = []
+
+    def counting_map_file(path):
+        mapped.append(path)
+        return map_file(path)
+
+    monkeypatch.setattr(cache_module, "map_file", counting_map_file)
+    cache = PayloadCache()
+
+    first = cache.get(DOCUMENT)
+    second = cache.get(DOCUMENT)
+
+    assert second is first
+    assert mapped == [os.path.abspath(DOCUMENT)]
+    assert cache.stats()["hits"] == 1
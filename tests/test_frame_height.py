@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_frame_height.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_size_the_frame_to_the_laid_out_pages(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with the frame height set before rendering")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(iframe_frame.locator('div[id="page_8"]')).to_be_attached()
+    page.wait_for_timeout(500)
+
+    iframe_box = page.locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').bounding_box()
+    pages_height = pdf_viewer.evaluate(
+        "viewer => [...viewer.querySelectorAll('div.page')].reduce((h, p) => h + p.getBoundingClientRect().height, 0)"
+    )
+    # The frame holds all the pages with the spacing between them
+    assert abs(iframe_box["height"] - (pages_height + 7 * 10)) <= 2
+
+
+def test_should_scroll_to_the_page_before_all_pages_are_rendered(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    expect(iframe_frame.locator('div[id="page_5"]')).to_be_in_viewport()
+
+    canvases = wait_for_canvases(iframe_frame.locator('div[id="pdfViewer"] canvas'))
+    assert len(canvases) == 8
+    expect(iframe_frame.locator('div[id="page_5"]')).to_be_in_viewport()
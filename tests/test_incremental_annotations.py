@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_incremental_annotations.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_update_annotations_without_rendering_the_pages_again(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with incremental annotations")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(pdf_viewer).to_be_visible()
+
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert len(canvases) == 8
+    expect(pdf_viewer.locator("svg.annotationOverlay")).to_have_count(8)
+
+    # Mark the rendered pages, a new rendering would replace them
+    iframe_frame.locator('canvas[id="canvas_page_1"]').evaluate("canvas => canvas.dataset.kept = 'true'")
+    iframe_frame.locator('div[id="page_2"] svg.annotationOverlay').evaluate("svg => svg.dataset.kept = 'true'")
+
+    page.get_by_text("page 1", exact=True).click()
+
+    expect(pdf_viewer.locator("svg.annotationOverlay")).to_have_count(1)
+    expect(iframe_frame.locator('div[id="page_1"] svg.annotationOverlay')).to_have_count(1)
+    expect(iframe_frame.locator('canvas[id="canvas_page_1"][data-kept="true"]')).to_have_count(1)
+
+    page.get_by_text("red", exact=True).click()
+
+    expect(pdf_viewer.locator("svg.annotationOverlay")).to_have_count(8)
+    expect(iframe_frame.locator('div[id="page_2"] svg.annotationOverlay path')).to_have_count(1)
+    expect(iframe_frame.locator('canvas[id="canvas_page_1"][data-kept="true"]')).to_have_count(1)
+
+
+def test_should_keep_unchanged_page_overlays(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    wait_for_canvases(iframe_frame.locator('div[id="pdfViewer"] canvas'))
+
+    page.get_by_text("red", exact=True).click()
+    expect(iframe_frame.locator('div[id="page_2"] svg.annotationOverlay path')).to_have_count(1)
+    iframe_frame.locator('div[id="page_2"] svg.annotationOverlay').evaluate("svg => svg.dataset.kept = 'true'")
+
+    # Only the overlays of the other pages change
+    page.get_by_text("page 1", exact=True).click()
+    expect(iframe_frame.locator('div[id="page_2"] svg.annotationOverlay')).to_have_count(0)
+
+    page.get_by_text("red", exact=True).click()
+    expect(iframe_frame.locator('div[id="page_2"] svg.annotationOverlay path')).to_have_count(1)
+    expect(iframe_frame.locator('div[id="page_1"] svg.annotationOverlay path')).to_have_count(1)
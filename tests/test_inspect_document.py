@@ -0,0 +1,59 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_inspect_document.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_report_the_document_metadata(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with the document inspected in Python")).to_be_visible()
+    expect(page.get_by_text("Page count: 8")).to_be_visible()
+    expect(page.get_by_text("First outline entry on page 1")).to_be_visible()
+
+
+def test_should_lay_out_the_pages_from_the_given_dimensions(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert len(canvases) == 3
+    for page_number in [1, 3, 8]:
+        expect(iframe_frame.locator(f'div[id="page_{page_number}"]')).to_be_attached()
+    expect(iframe_frame.locator('div[id="page_2"]')).not_to_be_attached()
+
+    # The pages of test.pdf are 595.276 x 782.362 points, scaled to fit the width of the viewer
+    page_box = iframe_frame.locator('div[id="page_1"]').bounding_box()
+    assert abs(page_box["height"] / page_box["width"] - 782.362 / 595.276) < 0.01
+
+
+def test_should_reject_pages_not_in_the_document(page: Page):
+    expect(page.get_by_text("Page 9 rejected")).to_be_visible()
+    expect(page.locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]')).to_have_count(1)
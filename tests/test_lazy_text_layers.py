@@ -0,0 +1,60 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_lazy_text_layers.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_build_text_layers_near_the_visible_area_only(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with lazy text layers")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(pdf_viewer).to_be_visible()
+
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert len(canvases) == 8
+
+    expect(iframe_frame.locator('div[id="page_1"] div.textLayer')).to_have_count(1)
+    expect(iframe_frame.locator('div[id="page_8"] div.textLayer')).to_have_count(0)
+    text_in_pdf = pdf_viewer.get_by_text("from LaH10 to room–temperature").nth(0)
+    expect(text_in_pdf).to_be_visible()
+
+
+def test_should_build_and_release_text_layers_while_scrolling(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    expect(iframe_frame.locator('div[id="page_1"] div.textLayer')).to_have_count(1)
+
+    iframe_frame.locator('div[id="page_8"]').scroll_into_view_if_needed()
+
+    expect(iframe_frame.locator('div[id="page_8"] div.textLayer')).to_have_count(1)
+    # The first page is far from the visible area
+    expect(iframe_frame.locator('div[id="page_1"] div.textLayer')).to_have_count(0)
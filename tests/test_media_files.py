@@ -0,0 +1,121 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from streamlit.runtime import media_file_manager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+import streamlit_pdf_viewer
+from streamlit_pdf_viewer.rendering import PageImage
+from tests import ROOT_DIRECTORY
+
+DOCUMENT = os.path.join(ROOT_DIRECTORY, "resources", "test.pdf")
+SESSION_ID = "session"
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the media file registrations, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+class CountingStorage(MemoryMediaFileStorage):
+    """Counts the files read and hashed by the media file manager."""
+
+    def __init__(self):
+        super().__init__("/media")
+        self.loads = 0
+
+    def load_and_get_id(self, *args, **kwargs):
+        self.loads += 1
+        return super().load_and_get_id(*args, **kwargs)
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = CountingStorage()
+    media_file_mgr = MediaFileManager(storage)
+    monkeypatch.setattr(streamlit_pdf_viewer, "runtime",
+                        SimpleNamespace(get_instance=lambda: SimpleNamespace(media_file_mgr=media_file_mgr)))
+    monkeypatch.setattr(streamlit_pdf_viewer, "get_script_run_ctx", lambda: SimpleNamespace(session_id=SESSION_ID))
+    monkeypatch.setattr(media_file_manager, "_get_session_id", lambda: SESSION_ID)
+    monkeypatch.setattr(streamlit_pdf_viewer.st, "session_state", {})
+    storage.media_file_mgr = media_file_mgr
+    return storage
+
+
+def rerun(storage, register):
+    """Run a registration as a script run does, between the clean-ups of the media file manager."""
+    storage.media_file_mgr.clear_session_refs(SESSION_ID)
+    result = register()
+    storage.media_file_mgr.remove_orphaned_files()
+    return result
+
+
+def test_registers_a_document_once_per_session(storage):
+    url, file_id = rerun(storage, lambda: streamlit_pdf_viewer._register_media_file(DOCUMENT, "viewer"))
+
+    assert rerun(storage, lambda: streamlit_pdf_viewer._register_media_file(DOCUMENT, "viewer")) == (url, file_id)
+
+    assert storage.loads == 1
+    # The file is still referenced by the session, and not removed as orphaned
+    assert storage.get_file(file_id)
+
+
+def test_registers_a_changed_document_again(storage, tmp_path):
+    path = tmp_path / "document.pdf"
+    path.write_bytes(b"%PDF-a")
+    _, first_id = rerun(storage, lambda: streamlit_pdf_viewer._register_media_file(str(path), "viewer"))
+
+    path.write_bytes(b"%PDF-bb")
+    _, second_id = rerun(storage, lambda: streamlit_pdf_viewer._register_media_file(str(path), "viewer"))
+
+    assert storage.loads == 2
+    assert second_id != first_id
+
+
+def test_registers_page_images_once_per_session(storage):
+    images = [PageImage(page, DOCUMENT, 100, 140, "image/webp") for page in (1, 2)]
+
+    first = rerun(storage, lambda: streamlit_pdf_viewer._register_page_images(images, "viewer", "digest", "page"))
+    second = rerun(storage, lambda: streamlit_pdf_viewer._register_page_images(images, "viewer", "digest", "page"))
+
+    assert first == second
+    assert storage.loads == 2
+
+
+@pytest.mark.parametrize("version, supported", [
+    ("1.13.0", False), ("1.14.0", True), ("1.65.0", True), ("1.65.1.dev20260101", True), ("1.66.0", False),
+    ("2.0.0", False), ("unknown", False),
+])
+def test_references_media_files_only_for_the_checked_streamlit_versions(version, supported):
+    assert streamlit_pdf_viewer._supports_media_file_references(version) is supported
+
+
+def test_registers_the_files_again_for_other_streamlit_versions(storage, monkeypatch):
+    monkeypatch.setattr(streamlit_pdf_viewer, "_MEDIA_FILE_REFERENCES", False)
+
+    url, file_id = rerun(storage, lambda: streamlit_pdf_viewer._register_media_file(DOCUMENT, "viewer"))
+    assert rerun(storage, lambda: streamlit_pdf_viewer._register_media_file(DOCUMENT, "viewer")) == (url, file_id)
+
+    # Read again at each rerun, and still kept by the media file manager
+    assert storage.loads == 2
+    assert storage.get_file(file_id)
+
+
+def test_registers_a_file_removed_by_the_media_file_manager_again(storage):
+    _, file_id = rerun(storage, lambda: streamlit_pdf_viewer._register_media_file(DOCUMENT, "viewer"))
+    # The session ended, its files were removed
+    storage.media_file_mgr.clear_session_refs(SESSION_ID)
+    storage.media_file_mgr.remove_orphaned_files()
+
+    assert rerun(storage, lambda: streamlit_pdf_viewer._register_media_file(DOCUMENT, "viewer"))[1] == file_id
+
+    assert storage.loads == 2
+    assert storage.get_file(file_id)
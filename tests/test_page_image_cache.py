@@ -0,0 +1,122 @@
+import os
+import sys
+
+import pytest
+
+from streamlit_pdf_viewer import rendering
+from streamlit_pdf_viewer.rendering import PageImageCache, start_process_pool
+from tests import ROOT_DIRECTORY
+
+pytest.importorskip("pypdfium2")
+
+DOCUMENT = os.path.join(ROOT_DIRECTORY, "resources", "test.pdf")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the page image cache, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+def document(variant: int) -> bytes:
+    with open(DOCUMENT, 'rb') as fo:
+        # Trailing comments make different documents with the same pages
+        return fo.read() + f"\n% {variant}\n".encode("ascii")
+
+
+def test_records_the_sizes_of_the_images_next_to_them(tmp_path, monkeypatch):
+    PageImageCache(cache_dir=str(tmp_path), workers=0).thumbnails(DOCUMENT, pages=[1, 2], width=60)
+
+    def open_image(*args, **kwargs):
+        raise AssertionError("the image was opened")
+
+    monkeypatch.setattr("PIL.Image.open", open_image)
+    images = PageImageCache(cache_dir=str(tmp_path), workers=0).thumbnails(DOCUMENT, pages=[1, 2], width=60)
+
+    assert [image.width for image in images] == [60, 60]
+    assert all(image.height > 0 for image in images)
+
+
+def test_removes_the_least_recently_used_documents_over_max_bytes(tmp_path):
+    cache = PageImageCache(cache_dir=str(tmp_path), workers=0, max_bytes=1)
+    first = cache.thumbnails(document(1), pages=[1], width=60)[0]
+    first_directory = os.path.dirname(first.path)
+    # Out of the grace period
+    os.utime(first_directory, (1, 1))
+
+    second = cache.thumbnails(document(2), pages=[1], width=60)[0]
+
+    # The copy of the binary input is removed with the images
+    assert not os.path.exists(first_directory)
+    assert os.path.exists(second.path)
+    assert os.path.exists(os.path.join(os.path.dirname(second.path), "document.pdf"))
+
+
+def test_keeps_the_recently_used_documents(tmp_path):
+    cache = PageImageCache(cache_dir=str(tmp_path), workers=0, max_bytes=1)
+    first = cache.thumbnails(document(1), pages=[1], width=60)[0]
+
+    cache.thumbnails(document(2), pages=[1], width=60)
+
+    assert os.path.exists(first.path)
+
+
+def test_renders_a_removed_document_again(tmp_path):
+    cache = PageImageCache(cache_dir=str(tmp_path), workers=0, max_bytes=1)
+    first = cache.thumbnails(document(1), pages=[1], width=60)[0]
+    os.utime(os.path.dirname(first.path), (1, 1))
+    cache.thumbnails(document(2), pages=[1], width=60)
+
+    again = cache.thumbnails(document(1), pages=[1], width=60)[0]
+
+    assert os.path.exists(again.path)
+    assert again.width == 60
+
+
+def test_starts_all_the_workers_of_the_pool_at_once(tmp_path, monkeypatch):
+    main_module = sys.modules["__main__"]
+    executor = start_process_pool(2)
+    try:
+        assert sys.modules["__main__"] is main_module
+        assert len(executor._processes) == 2
+
+        def hide_main_script():
+            raise AssertionError("the main module was hidden after the workers were started")
+
+        monkeypatch.setattr(rendering, "_without_main_script", hide_main_script)
+        cache = PageImageCache(cache_dir=str(tmp_path), workers=2)
+        cache._executor = executor
+        images = cache.thumbnails(DOCUMENT, width=60)
+
+        assert len(images) == 8
+        assert all(os.path.exists(image.path) for image in images)
+    finally:
+        executor.shutdown()
+
+
+def test_forgets_the_aliases_of_removed_documents(tmp_path):
+    cache = PageImageCache(cache_dir=str(tmp_path / "pages"), workers=0, max_bytes=1)
+    path = tmp_path / "document.pdf"
+    path.write_bytes(document(1))
+    first = cache.thumbnails(str(path), pages=[1], width=60)[0]
+    os.utime(os.path.dirname(first.path), (1, 1))
+
+    cache.thumbnails(document(2), pages=[1], width=60)
+
+    assert cache._aliases == {}
+
+
+def test_keeps_one_alias_per_file(tmp_path):
+    cache = PageImageCache(cache_dir=str(tmp_path / "pages"), workers=0)
+    path = tmp_path / "document.pdf"
+    for variant in range(3):
+        path.write_bytes(document(variant))
+        os.utime(path, (variant + 1, variant + 1))
+        cache.digest(str(path))
+
+    assert len(cache._aliases) == 1
@@ -0,0 +1,27 @@
+import pytest
+
+import streamlit_pdf_viewer
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the page images asked for by the viewer, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+def test_keeps_the_pages_asked_for_by_the_viewer(monkeypatch):
+    state = {}
+    monkeypatch.setattr(streamlit_pdf_viewer.st, "session_state", state)
+    assert streamlit_pdf_viewer._requested_page_images("viewer") is None
+
+    state["viewer"] = {"render_scale": 1.1, "pages": [2, 3], "request": 123}
+    assert streamlit_pdf_viewer._requested_page_images("viewer") == (1.25, [2, 3])
+
+    # Kept at the following reruns, when the viewer returns other values
+    state["viewer"] = 0
+    assert streamlit_pdf_viewer._requested_page_images("viewer") == (1.25, [2, 3])
@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from streamlit_pdf_viewer import cache as cache_module
+from streamlit_pdf_viewer.cache import PayloadCache
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the cache, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+def document(index: int, size: int = 300) -> bytes:
+    return bytes([index]) * size
+
+
+# Size of the base64 payload of a 300 bytes document
+ENTRY_BYTES = 400
+
+
+def test_evicts_least_recently_used_documents():
+    cache = PayloadCache(max_bytes=2 * ENTRY_BYTES)
+    first, second, third = document(1), document(2), document(3)
+
+    cache.get(first)
+    cache.get(second)
+    cache.get(first)
+    cache.get(third)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["current_bytes"] == 2 * ENTRY_BYTES
+    # The second document was the least recently used
+    cache.get(first)
+    cache.get(third)
+    assert cache.stats()["misses"] == 3
+    cache.get(second)
+    assert cache.stats()["misses"] == 4
+
+
+def test_does_not_store_documents_larger_than_the_budget():
+    cache = PayloadCache(max_bytes=ENTRY_BYTES - 1)
+
+    payload = cache.get(document(1))
+
+    assert payload.size == 300
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["current_bytes"] == 0
+
+
+def test_lowering_max_bytes_evicts_entries():
+    cache = PayloadCache(max_bytes=3 * ENTRY_BYTES)
+    for index in range(3):
+        cache.get(document(index))
+
+    cache.max_bytes = ENTRY_BYTES
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["evictions"] == 2
+    assert stats["current_bytes"] == ENTRY_BYTES
+    assert stats["max_bytes"] == ENTRY_BYTES
+
+
+def test_rejects_a_negative_max_bytes():
+    cache = PayloadCache()
+
+    with pytest.raises(ValueError):
+        cache.max_bytes = -1
+
+
+def test_evicting_a_document_drops_its_file_alias(tmp_path):
+    path = tmp_path / "document.pdf"
+    path.write_bytes(document(1))
+    cache = PayloadCache(max_bytes=ENTRY_BYTES)
+
+    cache.get(str(path))
+    cache.get(document(2))
+    cache.get(str(path))
+
+    assert cache.stats()["misses"] == 3
+
+
+def test_concurrent_misses_for_the_same_content_are_accounted_once(tmp_path, monkeypatch):
+    path = tmp_path / "document.pdf"
+    path.write_bytes(document(1))
+    cache = PayloadCache(max_bytes=4 * ENTRY_BYTES)
+    # Both requests encode the document at the same time, as with different loading locks
+    monkeypatch.setattr(cache, "_loading", lambda key: threading.Lock())
+    barrier = threading.Barrier(2, timeout=5)
+    encode_base64 = cache_module.encode_base64
+
+    def encode_together(binary):
+        barrier.wait()
+        return encode_base64(binary)
+
+    monkeypatch.setattr(cache_module, "encode_base64", encode_together)
+    threads = [threading.Thread(target=cache.get, args=(source,)) for source in (str(path), document(1))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats["misses"] == 2
+    assert stats["entries"] == 1
+    assert stats["current_bytes"] == ENTRY_BYTES
@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_prewarm.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_report_the_prewarmed_documents(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with pre-warmed caches")).to_be_visible()
+    expect(page.get_by_text("Prewarmed 1 documents, 1 failed")).to_be_visible()
+
+
+def test_should_display_the_document_from_the_caches(page: Page):
+    expect(page.get_by_text("Payload from cache: True")).to_be_visible()
+    expect(page.get_by_text("Metadata from cache: True")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    canvases = wait_for_canvases(iframe_frame.locator('div[id="pdfViewer"] canvas'))
+    assert len(canvases) == 8
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_progressive_rendering.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_sharpen_pages_after_preview(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with progressive rendering")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(pdf_viewer).to_be_visible()
+
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert len(canvases) == 8
+
+    # Once sharpened, the first page has the resolution of the boost
+    first_canvas = iframe_frame.locator('canvas[id="canvas_page_1"]')
+    expect(first_canvas).to_be_visible()
+    page.wait_for_function(
+        """() => {
+            const frame = document.querySelector('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]');
+            const canvas = frame.contentDocument.getElementById('canvas_page_1');
+            return canvas && canvas.width >= 4 * parseFloat(canvas.style.width) - 1;
+        }""",
+        timeout=20000,
+    )
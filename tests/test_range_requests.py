@@ -0,0 +1,101 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from streamlit_pdf_viewer.server import DocumentServer, parse_range
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the document server, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+@pytest.fixture(scope="module")
+def document_server():
+    server = DocumentServer()
+    yield server
+    server.shutdown()
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=-100", (900, 999)),
+    # A suffix longer than the document selects all of it
+    ("bytes=-5000", (0, 999)),
+    # An end past the document is clamped
+    ("bytes=900-5000", (900, 999)),
+    (" bytes=10-10 ", (10, 10)),
+])
+def test_parses_single_ranges(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [None, "", "bytes=-", "bytes=0-9,20-29", "items=0-9", "bytes=a-b"])
+def test_serves_the_whole_document_for_missing_or_unsupported_ranges(header):
+    assert parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=5000-6000", "bytes=20-10", "bytes=-0"])
+def test_rejects_unsatisfiable_ranges(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 1000)
+
+
+def fetch(url: str, headers: dict):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, dict(error.headers), error.read()
+
+
+def test_serves_partial_content(document_server):
+    data = bytes(range(256)) * 4
+    url, _ = document_server.register(data)
+
+    status, headers, body = fetch(url, {"Range": "bytes=-16"})
+
+    assert status == 206
+    assert headers["Content-Range"] == "bytes 1008-1023/1024"
+    assert headers["Content-Length"] == "16"
+    assert body == data[-16:]
+
+
+def test_serves_an_open_ended_range(document_server):
+    data = bytes(range(256)) * 4
+    url, _ = document_server.register(data)
+
+    status, headers, body = fetch(url, {"Range": "bytes=1000-"})
+
+    assert status == 206
+    assert headers["Content-Range"] == "bytes 1000-1023/1024"
+    assert body == data[1000:]
+
+
+def test_answers_416_to_an_unsatisfiable_range(document_server):
+    url, _ = document_server.register(b"%PDF-" + bytes(100))
+
+    status, headers, body = fetch(url, {"Range": "bytes=500-"})
+
+    assert status == 416
+    assert headers["Content-Range"] == "bytes */105"
+    assert body == b""
+
+
+def test_serves_the_whole_document_without_range(document_server):
+    data = b"%PDF-" + bytes(100)
+    url, _ = document_server.register(data)
+
+    status, headers, body = fetch(url, {})
+
+    assert status == 200
+    assert headers["Accept-Ranges"] == "bytes"
+    assert body == data
@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from streamlit_pdf_viewer.cache import PayloadCache
+from streamlit_pdf_viewer.remote import RemoteDocumentCache
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the remote cache, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+class OriginServer(ThreadingHTTPServer):
+    """Serves documents by path with an ETag, and records the requests it receives."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), OriginHandler)
+        self.documents = {}
+        self.requests = []
+        self.send_length = True
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server_port}{path}"
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    server: OriginServer
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        data, etag = self.server.documents[self.path]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("ETag", etag)
+        if self.server.send_length:
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def origin():
+    server = OriginServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def conditional_requests(origin: OriginServer):
+    return [request for request in origin.requests if request[1] is not None]
+
+
+def last_used(path: str, used_at: float):
+    """Set the time a cached document was last used, as recorded in its metadata."""
+    metadata_path = f"{path[:-len('.pdf')]}.json"
+    with open(metadata_path, 'r', encoding='utf-8') as fo:
+        metadata = json.load(fo)
+    metadata["used_at"] = used_at
+    with open(metadata_path, 'w', encoding='utf-8') as fo:
+        json.dump(metadata, fo)
+
+
+def test_revalidates_with_a_conditional_request(origin, tmp_path):
+    origin.documents["/a.pdf"] = (b"%PDF-a", '"a1"')
+    cache = RemoteDocumentCache(cache_dir=str(tmp_path), revalidate_after=0)
+
+    path = cache.fetch(origin.url("/a.pdf"))
+    assert cache.fetch(origin.url("/a.pdf")) == path
+
+    assert len(origin.requests) == 2
+    assert conditional_requests(origin) == [("/a.pdf", '"a1"')]
+    with open(path, 'rb') as fo:
+        assert fo.read() == b"%PDF-a"
+
+
+def test_does_not_revalidate_fresh_documents(origin, tmp_path):
+    origin.documents["/a.pdf"] = (b"%PDF-a", '"a1"')
+    cache = RemoteDocumentCache(cache_dir=str(tmp_path), revalidate_after=3600)
+
+    cache.fetch(origin.url("/a.pdf"))
+    cache.fetch(origin.url("/a.pdf"))
+
+    assert len(origin.requests) == 1
+
+
+def test_downloads_a_changed_document_again(origin, tmp_path):
+    origin.documents["/a.pdf"] = (b"%PDF-a", '"a1"')
+    cache = RemoteDocumentCache(cache_dir=str(tmp_path), revalidate_after=0)
+    cache.fetch(origin.url("/a.pdf"))
+
+    origin.documents["/a.pdf"] = (b"%PDF-b", '"a2"')
+    path = cache.fetch(origin.url("/a.pdf"))
+
+    assert conditional_requests(origin) == [("/a.pdf", '"a1"')]
+    with open(path, 'rb') as fo:
+        assert fo.read() == b"%PDF-b"
+
+
+def test_uses_the_cached_copy_when_the_server_is_unreachable(origin, tmp_path):
+    origin.documents["/a.pdf"] = (b"%PDF-a", '"a1"')
+    cache = RemoteDocumentCache(cache_dir=str(tmp_path), revalidate_after=0, timeout=2)
+    path = cache.fetch(origin.url("/a.pdf"))
+    url = origin.url("/a.pdf")
+
+    origin.shutdown()
+    origin.server_close()
+
+    assert cache.fetch(url) == path
+
+
+@pytest.mark.parametrize("send_length", [True, False])
+def test_rejects_documents_larger_than_max_document_bytes(origin, tmp_path, send_length):
+    origin.documents["/large.pdf"] = (b"%PDF-" + bytes(1000), '"large"')
+    origin.send_length = send_length
+    cache = RemoteDocumentCache(cache_dir=str(tmp_path), max_document_bytes=500)
+
+    with pytest.raises(ValueError):
+        cache.fetch(origin.url("/large.pdf"))
+
+    assert [name for name in os.listdir(tmp_path) if name.endswith((".pdf", ".part"))] == []
+
+
+def test_removes_the_least_recently_used_documents_over_max_bytes(origin, tmp_path):
+    for name in ("a", "b", "c"):
+        origin.documents[f"/{name}.pdf"] = (b"%PDF-" + bytes(95), f'"{name}"')
+    cache = RemoteDocumentCache(cache_dir=str(tmp_path), max_bytes=250)
+
+    first = cache.fetch(origin.url("/a.pdf"))
+    second = cache.fetch(origin.url("/b.pdf"))
+    # Out of the grace period
+    last_used(first, 1)
+    last_used(second, 2)
+    third = cache.fetch(origin.url("/c.pdf"))
+
+    assert not os.path.exists(first)
+    assert not os.path.exists(f"{first[:-len('.pdf')]}.json")
+    assert os.path.exists(second)
+    assert os.path.exists(third)
+
+
+def test_keeps_the_recently_used_documents(origin, tmp_path):
+    for name in ("a", "b"):
+        origin.documents[f"/{name}.pdf"] = (b"%PDF-" + bytes(95), f'"{name}"')
+    cache = RemoteDocumentCache(cache_dir=str(tmp_path), max_bytes=150)
+
+    first = cache.fetch(origin.url("/a.pdf"))
+    cache.fetch(origin.url("/b.pdf"))
+
+    # Its path may still be read by the session which fetched it
+    assert os.path.exists(first)
+
+
+def test_fetching_a_cached_document_keeps_its_file_unchanged(origin, tmp_path):
+    origin.documents["/a.pdf"] = (b"%PDF-a", '"a1"')
+    cache = RemoteDocumentCache(cache_dir=str(tmp_path), revalidate_after=0)
+    payloads = PayloadCache()
+
+    path = cache.fetch(origin.url("/a.pdf"))
+    last_used(path, 1)
+    modified = os.stat(path).st_mtime_ns
+    first = payloads.get(path)
+    second = payloads.get(cache.fetch(origin.url("/a.pdf")))
+
+    # The use is recorded in the metadata, the payload cache still finds the file by its modification time
+    assert os.stat(path).st_mtime_ns == modified
+    assert second is first
+    assert payloads.stats()["misses"] == 1
+    assert len(payloads._aliases) == 1
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from tests import ROOT_DIRECTORY
+
+SCHEDULER = os.path.join(ROOT_DIRECTORY, "streamlit_pdf_viewer", "frontend", "src", "RenderScheduler.js")
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="requires Node.js")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    # Unit tests of the render scheduler of the frontend, run with Node.js, no app to start
+    yield None
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app():
+    yield
+
+
+def run_scheduler(tmp_path, script: str):
+    """Run a script using the render scheduler with Node.js, and return the JSON it prints."""
+    # Copied as an ES module, the frontend package does not declare its type
+    shutil.copy(SCHEDULER, tmp_path / "RenderScheduler.mjs")
+    (tmp_path / "test.mjs").write_text(
+        "import RenderScheduler from './RenderScheduler.mjs';\n"
+        "const tick = () => new Promise(resolve => setTimeout(resolve, 0));\n"
+        "const task = (name, log) => ({cancel: () => log.push(`cancelled ${name}`)});\n"
+        f"{script}\n",
+        encoding="utf-8",
+    )
+    result = subprocess.run(["node", str(tmp_path / "test.mjs")], capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def test_runs_the_pending_jobs_by_priority(tmp_path):
+    order = run_scheduler(tmp_path, """
+const scheduler = new RenderScheduler(1);
+const order = [];
+let release;
+const blocker = scheduler.schedule('blocker', () => new Promise(resolve => { release = resolve; }), () => 0);
+const priorities = {far: 3, near: 1, middle: 2};
+const done = Object.entries(priorities).map(([key, priority]) => (
+  scheduler.schedule(key, async () => { order.push(key); }, () => priorities[key])
+));
+await tick();
+// The priorities are read when a slot frees up
+priorities.far = 0;
+release();
+await Promise.all([blocker, ...done]);
+console.log(JSON.stringify(order));
+""")
+
+    assert order == ["far", "near", "middle"]
+
+
+def test_cancels_the_running_job_replaced_by_a_new_one(tmp_path):
+    result = run_scheduler(tmp_path, """
+const scheduler = new RenderScheduler(2);
+const log = [];
+let release;
+const first = scheduler.schedule('page', async (track, isCancelled) => {
+  track(task('first', log));
+  await new Promise(resolve => { release = resolve; });
+  if (!isCancelled()) log.push('first drawn');
+}, () => 0);
+await tick();
+const second = scheduler.schedule('page', async (track) => {
+  track(task('second', log));
+  log.push('second drawn');
+}, () => 0);
+release();
+console.log(JSON.stringify({first: await first, second: await second, log}));
+""")
+
+    assert result == {"first": False, "second": True, "log": ["cancelled first", "second drawn"]}
+
+
+def test_cancels_all_the_jobs(tmp_path):
+    result = run_scheduler(tmp_path, """
+const scheduler = new RenderScheduler(1);
+const log = [];
+let release;
+const running = scheduler.schedule('running', async (track, isCancelled) => {
+  track(task('running', log));
+  await new Promise(resolve => { release = resolve; });
+  // Render tasks started after the cancellation are cancelled right away
+  track(task('late', log));
+}, () => 0);
+const pending = scheduler.schedule('pending', async () => log.push('pending drawn'), () => 1);
+await tick();
+scheduler.cancelAll();
+release();
+console.log(JSON.stringify({running: await running, pending: await pending, log}));
+""")
+
+    assert result == {"running": False, "pending": False, "log": ["cancelled running", "cancelled late"]}
+
+
+def test_reports_cancelled_renderings_as_not_completed(tmp_path):
+    result = run_scheduler(tmp_path, """
+const scheduler = new RenderScheduler(1);
+const cancelled = scheduler.schedule('page', async () => {
+  const error = new Error('Rendering cancelled');
+  error.name = 'RenderingCancelledException';
+  throw error;
+}, () => 0);
+const failed = scheduler.schedule('other', async () => { throw new Error('broken'); }, () => 0)
+  .then(() => 'resolved', error => error.message);
+console.log(JSON.stringify({cancelled: await cancelled, failed: await failed}));
+""")
+
+    assert result == {"cancelled": False, "failed": "broken"}
@@ -0,0 +1,77 @@
+import os
+import re
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_server_rendering.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_show_the_pages_rendered_by_the_server(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with the pages rendered by the server")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    images = pdf_viewer.locator("img.pageImage")
+    expect(images).to_have_count(3)
+    expect(pdf_viewer.locator("canvas")).to_have_count(0)
+    expect(images.nth(0)).to_have_attribute("src", re.compile(r"/media/[0-9a-f]+\.webp$"))
+
+    # The images are rendered for the device pixels of the displayed page
+    first_image = iframe_frame.locator('img[id="image_page_1"]')
+    natural_width, displayed_width = first_image.evaluate(
+        "image => [image.naturalWidth, image.getBoundingClientRect().width * window.devicePixelRatio]"
+    )
+    assert natural_width >= displayed_width - 1
+
+
+def test_should_draw_and_click_annotations_over_the_images(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    expect(iframe_frame.locator('img[id="image_page_1"]')).to_be_visible()
+    expect(iframe_frame.locator('div[id="page_1"] svg.annotationOverlay path')).to_have_count(1)
+
+    page_box = iframe_frame.locator('div[id="page_1"]').bounding_box()
+    iframe_box = page.locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').bounding_box()
+    scale = page_box["width"] / 595.276
+    page.mouse.click(iframe_box["x"] + page_box["x"] + 140 * scale, iframe_box["y"] + page_box["y"] + 140 * scale)
+    expect(page.get_by_text("Clicked annotation target")).to_be_visible()
+
+
+def test_should_render_the_pages_again_when_zooming(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    first_image = iframe_frame.locator('img[id="image_page_1"]')
+    expect(first_image).to_be_visible()
+    source = first_image.get_attribute("src")
+
+    iframe_frame.locator("button.zoom-button").click()
+    iframe_frame.locator("button.zoom-preset").filter(has_text="200%").click()
+    # The server renders the pages at the new scale, which replace the stretched images
+    expect(first_image).not_to_have_attribute("src", source, timeout=15000)
+    expect(first_image).to_be_visible()
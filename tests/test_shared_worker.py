@@ -0,0 +1,50 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_shared_worker.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_render_all_viewers_with_a_shared_worker(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with a shared worker")).to_be_visible()
+
+    iframe_components = page.locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]')
+    expect(iframe_components).to_have_count(2)
+
+    for index in range(2):
+        iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(index)
+        pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+        expect(pdf_viewer).to_be_visible()
+        # Not the fallback to a worker per viewer
+        expect(pdf_viewer).to_have_attribute("data-pdf-worker", "shared")
+
+        canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+        assert len(canvases) == 8
@@ -0,0 +1,59 @@
+import os
+import re
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_thumbnails.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_show_a_thumbnail_per_page(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with a strip of page thumbnails")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    thumbnails = iframe_frame.locator('div[id="thumbnailStrip"] img.thumbnail')
+    expect(thumbnails).to_have_count(8)
+    expect(thumbnails.nth(0)).to_have_attribute("src", re.compile(r"/media/[0-9a-f]+\.webp$"))
+    expect(thumbnails.nth(0)).to_have_attribute("width", "100")
+    assert thumbnails.nth(0).evaluate("image => image.complete && image.naturalWidth") == 100
+
+    # The pages are rendered by the browser only near the visible area
+    canvases = wait_for_canvases(iframe_frame.locator('div[id="pdfViewer"] canvas'))
+    assert 0 < len(canvases) < 8
+
+
+def test_should_scroll_to_the_page_of_a_clicked_thumbnail(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    expect(iframe_frame.locator('img[id="thumbnail_1"]')).to_have_class(re.compile(r"\bactive\b"))
+
+    iframe_frame.locator('img[id="thumbnail_6"]').click()
+    expect(iframe_frame.locator('div[id="page_6"]')).to_be_in_viewport()
+    expect(iframe_frame.locator('div[id="page_6"] canvas')).to_be_attached()
+    expect(iframe_frame.locator('img[id="thumbnail_6"]')).to_have_class(re.compile(r"\bactive\b"))
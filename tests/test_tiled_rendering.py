@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_tiled_rendering.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_render_visible_tiles_only(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with tiled rendering")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(pdf_viewer).to_be_visible()
+
+    # The pages are too large for a single canvas
+    tiles = wait_for_canvases(pdf_viewer.locator("canvas.tile"))
+    assert len(tiles) > 0
+    expect(iframe_frame.locator('canvas[id^="canvas_page_"]')).to_have_count(0)
+
+    sizes = page.evaluate("""() => {
+        const frame = document.querySelector('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]');
+        return [...frame.contentDocument.querySelectorAll('canvas.tile')].map(canvas => [canvas.width, canvas.height]);
+    }""")
+    assert all(width <= 512 and height <= 512 for width, height in sizes)
+
+    # The first page alone has more than 2000 tiles, only those near the visible area are rendered
+    assert len(tiles) < 400
@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_virtualize.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+def test_should_render_only_pages_near_the_visible_area(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with virtualized pages")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(pdf_viewer).to_be_visible()
+
+    # All the pages are laid out, but only the first ones are rasterized
+    page_divs = pdf_viewer.locator('div.page')
+    expect(page_divs).to_have_count(8)
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert 0 < len(canvases) < 8
+    expect(iframe_frame.locator('canvas[id="canvas_page_1"]')).to_be_visible()
+    expect(iframe_frame.locator('canvas[id="canvas_page_8"]')).to_have_count(0)
+
+
+def test_should_render_pages_when_scrolled_into_view(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(iframe_frame.locator('canvas[id="canvas_page_1"]')).to_be_visible()
+
+    iframe_frame.locator('div[id="page_8"]').scroll_into_view_if_needed()
+
+    expect(iframe_frame.locator('canvas[id="canvas_page_8"]')).to_be_visible()
+    # The first page is far from the visible area and has been released
+    expect(iframe_frame.locator('canvas[id="canvas_page_1"]')).to_have_count(0)
@@ -0,0 +1,84 @@
+import os
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tests import ROOT_DIRECTORY, wait_for_canvases
+from tests.e2e_utils import StreamlitRunner
+
+BASIC_EXAMPLE_FILE = os.path.join(ROOT_DIRECTORY, "tests", "streamlit_apps", "example_zoom_transform.py")
+
+
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {
+        **browser_type_launch_args,
+        "firefox_user_prefs": {
+            "pdfjs.disabled": False,
+        }
+    }
+
+
+@pytest.fixture(autouse=True, scope="module")
+def streamlit_app():
+    with StreamlitRunner(Path(BASIC_EXAMPLE_FILE)) as runner:
+        yield runner
+
+
+@pytest.fixture(autouse=True, scope="function")
+def go_to_app(page: Page, streamlit_app: StreamlitRunner):
+    page.goto(streamlit_app.server_url)
+    # Wait for app to load
+    page.get_by_role("img", name="Running...").is_hidden()
+
+
+PAGE_WIDTH_SCRIPT = """() => {
+    const frame = document.querySelector('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]');
+    const page = frame.contentDocument.getElementById('page_1');
+    const canvas = frame.contentDocument.getElementById('canvas_page_1');
+    return {page: parseFloat(page.style.width), canvas: canvas ? parseFloat(canvas.style.width) : null};
+}"""
+
+
+def test_should_scale_pages_then_rasterize_again(page: Page):
+    expect(page.get_by_text("Test PDF Viewer with in-place zoom")).to_be_visible()
+
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    expect(pdf_viewer).to_be_visible()
+
+    canvases = wait_for_canvases(pdf_viewer.locator("canvas"))
+    assert len(canvases) == 8
+    before = page.evaluate(PAGE_WIDTH_SCRIPT)
+
+    iframe_frame.locator('button.zoom-button').click()
+    iframe_frame.locator('button').filter(has_text="Zoom In").click()
+    expect(iframe_frame.locator('button.zoom-button')).to_have_text("120%")
+
+    # The pages are resized right away, their canvases stay in place until rasterized again
+    assert page.evaluate(PAGE_WIDTH_SCRIPT)['page'] == pytest.approx(before['page'] * 1.2, rel=0.01)
+    expect(pdf_viewer.locator("canvas")).to_have_count(8)
+
+    page.wait_for_function(
+        f"""() => {{
+            const widths = ({PAGE_WIDTH_SCRIPT})();
+            return widths.canvas !== null && Math.abs(widths.canvas - widths.page) < 1;
+        }}""",
+        timeout=10000,
+    )
+
+
+def test_should_zoom_with_ctrl_wheel(page: Page):
+    iframe_frame = page.frame_locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0)
+    pdf_viewer = iframe_frame.locator('div[id="pdfViewer"]')
+    wait_for_canvases(pdf_viewer.locator("canvas"))
+    expect(iframe_frame.locator('button.zoom-button')).to_have_text("100%")
+
+    box = page.locator('iframe[title="streamlit_pdf_viewer.streamlit_pdf_viewer"]').nth(0).bounding_box()
+    page.mouse.move(box['x'] + box['width'] / 2, box['y'] + box['height'] / 2)
+    page.keyboard.down("Control")
+    page.mouse.wheel(0, -50)
+    page.keyboard.up("Control")
+
+    expect(iframe_frame.locator('button.zoom-button')).not_to_have_text("100%")